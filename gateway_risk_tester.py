@@ -18,13 +18,67 @@ import random
 import time
 import argparse
 import json
+import os
+import threading
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Tuple
 
+# orjson is optional - it writes large result files several times faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx + h2 are optional - with them, concurrent HEADs to a gateway multiplex over a single
+# HTTP/2 connection instead of each needing its own HTTP/1.1 connection
+try:
+    import httpx
+    import h2  # noqa: F401 - needed by httpx for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+PROBE_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if HTTP2_AVAILABLE else ())
+PROBE_CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.TransportError,) if HTTP2_AVAILABLE else ())
+
+# Concurrent probes allowed per gateway host - keeps one slow gateway from tying up
+# every worker while the rest of the fan-out keeps moving
+MAX_CONCURRENT_PER_GATEWAY = 4
+
+# Adaptive timeouts: probe timeout = clamp(3 x EMA of the gateway's response time); a probe that
+# outlives it is retried once with the full timeout, and a gateway that fails this many
+# full-timeout probes in a row is skipped for the rest of the run
+ADAPTIVE_TIMEOUT_FACTOR = 3
+ADAPTIVE_TIMEOUT_FLOOR = 1.5
+EMA_WEIGHT = 0.3
+DEAD_GATEWAY_FAILURES = 3
+
+TIMEOUT_STATUS = "⏰ Timeout"
+CONNECTION_ERROR_STATUS = "🔌 Connection Error"
+SKIPPED_STATUS = "⏭️ Skipped (dead)"
+EARLY_EXIT_STATUS = "⏭️ Skipped (early-exit)"
+
+# Fast triage: a CID available on this many gateways, including a reliable one, is
+# already certain to be low risk - its remaining probes can be skipped
+LOW_RISK_MIN_GATEWAYS = 3
+
+# Probe results are reused across runs for PROBE_CACHE_TTL seconds (0 disables the cache)
+PROBE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ipfs_gateway_tester.json")
+PROBE_CACHE_TTL = 300
+HTTP_ERROR_STATUS_PREFIX = "❌ HTTP "
+
+def _is_cacheable_probe(is_available: bool, status: str) -> bool:
+    """Only real HTTP answers are cached - timeouts and transport errors are re-probed next time."""
+    return is_available or status.startswith(HTTP_ERROR_STATUS_PREFIX)
+
 class IPFSGatewayTester:
-    def __init__(self):
-        # Comprehensive list of public IPFS gateways
-        self.all_gateways = [
+    def __init__(self, cache_ttl: int = PROBE_CACHE_TTL):
+        # Comprehensive list of public IPFS gateways (a tuple, so random.sample keeps working)
+        self.all_gateways = (
             "https://ipfs.io/ipfs/",
             "https://gateway.ipfs.io/ipfs/",
             "https://dweb.link/ipfs/",
@@ -43,60 +97,249 @@ class IPFSGatewayTester:
             "https://jorropo.net/ipfs/",
             "https://ipfs.joaoleitao.org/ipfs/",
             "https://ipfs.telos.miami/ipfs/",
-        ]
+        )
         
-        # High-risk gateways (shutting down)
-        self.high_risk_gateways = [
+        # High-risk gateways (shutting down) - frozensets for O(1) membership tests
+        self.high_risk_gateways = frozenset({
             "https://nftstorage.link/ipfs/",
             "https://w3s.link/ipfs/"
-        ]
+        })
         
         # Well-known reliable gateways
-        self.reliable_gateways = [
+        self.reliable_gateways = frozenset({
             "https://ipfs.io/ipfs/",
             "https://gateway.ipfs.io/ipfs/",
             "https://cloudflare-ipfs.com/ipfs/",
             "https://gateway.pinata.cloud/ipfs/"
-        ]
+        })
+        
+        # Gateway set of the current batch - reused by later calls that don't pass one
+        self._current_gateways = None
+        
+        # Short display names for printing ("https://ipfs.io/ipfs/" -> "ipfs.io")
+        self.display_names = {gateway: self._strip_gateway_url(gateway) for gateway in self.all_gateways}
+        
+        # One keep-alive session shared by all probe threads - repeat probes to a gateway
+        # reuse its pooled connection instead of paying a new TCP + TLS handshake.
+        # Connection failures get one quick retry; read timeouts are not retried.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=len(self.all_gateways),
+            pool_maxsize=MAX_CONCURRENT_PER_GATEWAY,
+            max_retries=Retry(total=1, read=0, backoff_factor=0.2)
+        ))
+        
+        # HTTP/2 client used instead of the session when httpx/h2 are installed
+        self.http2_client = None
+        if HTTP2_AVAILABLE:
+            self.http2_client = httpx.Client(
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=1,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+                )
+            )
+        
+        # Per-gateway concurrency limits
+        self._gateway_slots = {
+            gateway: threading.BoundedSemaphore(MAX_CONCURRENT_PER_GATEWAY)
+            for gateway in self.all_gateways
+        }
+        
+        # Per-run gateway health: {gateway: {'ema_rt', 'consecutive_failures'}}
+        self._gateway_health = {}
+        self._health_lock = threading.Lock()
+        
+        # Probe cache: {"gateway|cid": [timestamp, is_available, status, response_time]}
+        self.cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+        self._cache = self._load_probe_cache() if cache_ttl > 0 else {}
+
+    def _load_probe_cache(self) -> Dict:
+        """Load unexpired probe results from disk."""
+        try:
+            with open(PROBE_CACHE_PATH, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in cache.items()
+                if now - entry[0] < self.cache_ttl and _is_cacheable_probe(entry[1], entry[2])}
+
+    def save_probe_cache(self):
+        """Persist unexpired probe results to disk (best effort)."""
+        if self.cache_ttl <= 0:
+            return
+        now = time.time()
+        with self._cache_lock:
+            cache = {key: entry for key, entry in self._cache.items() if now - entry[0] < self.cache_ttl}
+        tmp_path = f"{PROBE_CACHE_PATH}.tmp"
+        try:
+            os.makedirs(os.path.dirname(PROBE_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, PROBE_CACHE_PATH)
+        except OSError as e:
+            print(f"⚠️ Could not save probe cache: {e}")
+
+    @staticmethod
+    def _strip_gateway_url(gateway: str) -> str:
+        return gateway.removeprefix('https://').removesuffix('/ipfs/')
+
+    def display_name(self, gateway: str) -> str:
+        """Short printable name for a gateway URL."""
+        name = self.display_names.get(gateway)
+        return name if name is not None else self._strip_gateway_url(gateway)
 
     def select_random_gateways(self, count: int = 5) -> List[str]:
         """Select random gateways for testing."""
         return random.sample(self.all_gateways, min(count, len(self.all_gateways)))
 
+    def _default_gateways(self) -> List[str]:
+        """Gateways for calls that don't specify any - sampled once, then reused."""
+        if self._current_gateways is None:
+            self._current_gateways = self.select_random_gateways()
+        return self._current_gateways
+
     def test_gateway_availability(self, gateway_url: str, cid: str, timeout: int = 10) -> Tuple[bool, str, float]:
         """
         Test if a CID is available through a specific IPFS gateway.
         Returns: (is_available, status_message, response_time)
         """
-        start_time = time.time()
+        cache_key = f"{gateway_url}|{cid}"
+        if self.cache_ttl > 0:
+            with self._cache_lock:
+                entry = self._cache.get(cache_key)
+            if entry and time.time() - entry[0] < self.cache_ttl:
+                return entry[1], entry[2], entry[3]
+        
+        with self._health_lock:
+            health = self._gateway_health.setdefault(gateway_url, {'ema_rt': None, 'consecutive_failures': 0})
+            if health['consecutive_failures'] >= DEAD_GATEWAY_FAILURES:
+                return False, SKIPPED_STATUS, 0.0
+            if health['ema_rt'] is None:
+                probe_timeout = timeout
+            else:
+                probe_timeout = min(timeout, max(ADAPTIVE_TIMEOUT_FLOOR, ADAPTIVE_TIMEOUT_FACTOR * health['ema_rt']))
+        
+        slots = self._gateway_slots.setdefault(gateway_url, threading.BoundedSemaphore(MAX_CONCURRENT_PER_GATEWAY))
+        with slots:
+            is_available, status, response_time = self._probe_gateway(gateway_url, cid, probe_timeout)
+            if status == TIMEOUT_STATUS and probe_timeout < timeout:
+                # Only the adaptive deadline expired - a cold CID may still be retrievable
+                is_available, status, retry_time = self._probe_gateway(gateway_url, cid, timeout)
+                response_time += retry_time
+        
+        with self._health_lock:
+            if status in (TIMEOUT_STATUS, CONNECTION_ERROR_STATUS):
+                health['consecutive_failures'] += 1
+            else:
+                # The gateway answered - it is alive even if it doesn't have this CID
+                health['consecutive_failures'] = 0
+                if health['ema_rt'] is None:
+                    health['ema_rt'] = response_time
+                else:
+                    health['ema_rt'] = (1 - EMA_WEIGHT) * health['ema_rt'] + EMA_WEIGHT * response_time
+        
+        if self.cache_ttl > 0 and _is_cacheable_probe(is_available, status):
+            with self._cache_lock:
+                self._cache[cache_key] = [time.time(), is_available, status, response_time]
+        
+        return is_available, status, response_time
+
+    def _probe_gateway(self, gateway_url: str, cid: str, timeout: int) -> Tuple[bool, str, float]:
+        """Issue the HEAD request for test_gateway_availability (caller holds a gateway slot)."""
+        start_time = time.perf_counter()
         try:
             url = f"{gateway_url}{cid}"
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
-            response_time = time.time() - start_time
+            if self.http2_client is not None:
+                response = self.http2_client.head(url, timeout=timeout)
+            else:
+                response = self.session.head(url, timeout=timeout, allow_redirects=True)
             
             if response.status_code == 200:
-                return True, f"✅ Available (HTTP {response.status_code})", response_time
+                is_available, status = True, f"✅ Available (HTTP {response.status_code})"
             else:
-                return False, f"❌ HTTP {response.status_code}", response_time
+                is_available, status = False, f"{HTTP_ERROR_STATUS_PREFIX}{response.status_code}"
                 
-        except requests.exceptions.Timeout:
-            response_time = time.time() - start_time
-            return False, "⏰ Timeout", response_time
-        except requests.exceptions.ConnectionError:
-            response_time = time.time() - start_time
-            return False, "🔌 Connection Error", response_time
+        except PROBE_TIMEOUT_ERRORS:
+            is_available, status = False, TIMEOUT_STATUS
+        except PROBE_CONNECTION_ERRORS:
+            is_available, status = False, CONNECTION_ERROR_STATUS
         except Exception as e:
-            response_time = time.time() - start_time
-            return False, f"❌ Error: {str(e)[:50]}", response_time
+            is_available, status = False, f"❌ Error: {str(e)[:50]}"
+        
+        return is_available, status, time.perf_counter() - start_time
 
     def test_single_cid(self, cid: str, gateways: List[str] = None, timeout: int = 10) -> Dict:
-        """Test a single CID across multiple gateways."""
+        """Test a single CID across multiple gateways (all gateways probed in parallel)."""
         if gateways is None:
-            gateways = self.select_random_gateways()
+            gateways = self._default_gateways()
         
         print(f"\n🔍 Testing CID: {cid}")
         print(f"🌐 Using {len(gateways)} gateways...")
         
+        probe_results = self._probe_all([cid], gateways, timeout, max_workers=len(gateways))
+        return self._summarize_cid(cid, gateways, probe_results)
+
+    def _probe_all(self, cids: List[str], gateways: List[str], timeout: int, max_workers: int,
+                   fast_triage: bool = False) -> Dict:
+        """
+        Probe every (CID, gateway) pair concurrently.
+        With fast_triage, probes for a CID that is already known to be low risk are
+        skipped and reported as EARLY_EXIT_STATUS.
+        Returns: dict {(cid, gateway): (is_available, status_message, response_time)}
+        """
+        if fast_triage:
+            # Reliable gateways first, so a CID can be triaged as early as possible
+            gateways = sorted(gateways, key=lambda gateway: gateway not in self.reliable_gateways)
+        pairs = [(cid, gateway) for cid in cids for gateway in gateways]
+        probe_results = {}
+        
+        triage_lock = threading.Lock()
+        available_counts = {}   # cid -> gateways confirmed available so far
+        reliable_confirmed = set()
+        triaged = set()
+        
+        def probe(cid, gateway):
+            if fast_triage and cid in triaged:
+                return False, EARLY_EXIT_STATUS, 0.0
+            result = self.test_gateway_availability(gateway, cid, timeout)
+            if fast_triage and result[0]:
+                with triage_lock:
+                    available_counts[cid] = available_counts.get(cid, 0) + 1
+                    if gateway in self.reliable_gateways:
+                        reliable_confirmed.add(cid)
+                    if cid in reliable_confirmed and available_counts[cid] >= LOW_RISK_MIN_GATEWAYS:
+                        triaged.add(cid)
+            return result
+        
+        # Each run starts with a clean bill of health for every gateway
+        with self._health_lock:
+            self._gateway_health.clear()
+        if not pairs:
+            return probe_results
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            future_to_pair = {
+                executor.submit(probe, cid, gateway): (cid, gateway)
+                for cid, gateway in pairs
+            }
+            for future in as_completed(future_to_pair):
+                probe_results[future_to_pair[future]] = future.result()
+        
+        return probe_results
+
+    def _summarize_cid(self, cid: str, gateways: List[str], probe_results: Dict,
+                       gateway_stats: List[Dict] = None) -> Dict:
+        """
+        Build the per-CID result dict from its probe results, printing each gateway line.
+        Everything is computed in a single pass over the gateways; when gateway_stats (the
+        gateway performance dicts, in the same order as gateways) is given, its counters
+        are updated in the same pass. Plain Python on purpose - this standalone script only
+        needs requests, so NumPy (a dependency of the Streamlit UI) is not used here.
+        """
         results = {
             'cid': cid,
             'gateway_results': {},
@@ -111,48 +354,68 @@ class IPFSGatewayTester:
             }
         }
         
-        # Test each gateway
-        for gateway in gateways:
-            is_available, status, response_time = self.test_gateway_availability(gateway, cid, timeout)
+        summary = results['summary']
+        successful_time_total = 0.0
+        reliable_available = False
+        high_risk_available = False
+        
+        for index, gateway in enumerate(gateways):
+            is_available, status, response_time = probe_results[(cid, gateway)]
+            is_high_risk = gateway in self.high_risk_gateways
+            # Never asked - the CID was already triaged or the gateway was already declared dead
+            skipped = status in (EARLY_EXIT_STATUS, SKIPPED_STATUS)
             
             results['gateway_results'][gateway] = {
                 'available': is_available,
                 'status': status,
                 'response_time': response_time,
-                'is_high_risk': gateway in self.high_risk_gateways
+                'is_high_risk': is_high_risk
             }
             
             if is_available:
-                results['summary']['available_count'] += 1
-                if response_time < results['summary']['fastest_time']:
-                    results['summary']['fastest_time'] = response_time
-                    results['summary']['fastest_gateway'] = gateway
-            else:
-                results['summary']['failed_count'] += 1
+                summary['available_count'] += 1
+                successful_time_total += response_time
+                high_risk_available = high_risk_available or is_high_risk
+                reliable_available = reliable_available or gateway in self.reliable_gateways
+                if response_time < summary['fastest_time']:
+                    summary['fastest_time'] = response_time
+                    summary['fastest_gateway'] = gateway
+            elif not skipped:
+                summary['failed_count'] += 1
+            
+            # Skipped probes aren't failures - keep them out of the gateway stats
+            if gateway_stats is not None and not skipped:
+                stats = gateway_stats[index]
+                stats['total_tests'] += 1
+                stats['total_response_time'] += response_time
+                if is_available:
+                    stats['success_count'] += 1
             
             print(f"  {gateway:<40} {status} ({response_time:.2f}s)")
         
         # Calculate average response time (only for successful requests)
-        successful_times = [r['response_time'] for r in results['gateway_results'].values() if r['available']]
-        if successful_times:
-            results['summary']['avg_response_time'] = sum(successful_times) / len(successful_times)
+        if summary['available_count']:
+            summary['avg_response_time'] = successful_time_total / summary['available_count']
         
         # Check if only available on high-risk gateways
-        available_gateways = [gw for gw, r in results['gateway_results'].items() if r['available']]
-        reliable_available = any(gw in self.reliable_gateways for gw in available_gateways)
-        high_risk_available = any(gw in self.high_risk_gateways for gw in available_gateways)
-        
-        results['summary']['high_risk_only'] = high_risk_available and not reliable_available
+        summary['high_risk_only'] = high_risk_available and not reliable_available
         
         return results
 
-    def test_multiple_cids(self, cids: List[str], gateways: List[str] = None, max_workers: int = 5) -> Dict:
-        """Test multiple CIDs with concurrent processing."""
+    def test_multiple_cids(self, cids: List[str], gateways: List[str] = None, max_workers: int = 32,
+                           timeout: int = 10, fast_triage: bool = False) -> Dict:
+        """
+        Test multiple CIDs with concurrent processing.
+        Every (CID, gateway) probe runs in parallel, so wall time is bounded by the
+        slowest gateway rather than the slowest CID.
+        """
         if gateways is None:
-            gateways = self.select_random_gateways()
+            gateways = self._default_gateways()
+        
+        self._current_gateways = gateways
         
         print(f"\n🚀 Starting batch test of {len(cids)} CID(s)")
-        print(f"🌐 Using gateways: {', '.join([gw.replace('https://', '').replace('/ipfs/', '') for gw in gateways])}")
+        print(f"🌐 Using gateways: {', '.join(self.display_name(gw) for gw in gateways)}")
         
         all_results = []
         risk_analysis = {
@@ -172,43 +435,33 @@ class IPFSGatewayTester:
                 'total_response_time': 0
             }
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all CID tests
-            future_to_cid = {
-                executor.submit(self.test_single_cid, cid, gateways): cid 
-                for cid in cids
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_cid):
-                cid = future_to_cid[future]
-                try:
-                    result = future.result()
-                    all_results.append(result)
-                    
-                    # Update gateway performance stats
-                    for gateway, gw_result in result['gateway_results'].items():
-                        stats = risk_analysis['gateway_performance'][gateway]
-                        stats['total_tests'] += 1
-                        stats['total_response_time'] += gw_result['response_time']
-                        if gw_result['available']:
-                            stats['success_count'] += 1
-                    
-                    # Categorize risk level
-                    available_count = result['summary']['available_count']
-                    high_risk_only = result['summary']['high_risk_only']
+        probe_results = self._probe_all(cids, gateways, timeout, max_workers, fast_triage)
+        
+        # Stats dicts aligned with gateways, so the per-result updates index a list
+        gateway_stats = [risk_analysis['gateway_performance'][gateway] for gateway in gateways]
+        
+        for cid in cids:
+            try:
+                print(f"\n🔍 Results for CID: {cid}")
+                # Summarizing also updates the gateway performance stats
+                result = self._summarize_cid(cid, gateways, probe_results, gateway_stats)
+                all_results.append(result)
+                
+                # Categorize risk level
+                available_count = result['summary']['available_count']
+                high_risk_only = result['summary']['high_risk_only']
+                
+                if available_count == 0:
+                    risk_analysis['unreachable'].append(result)
+                elif high_risk_only:
+                    risk_analysis['high_risk'].append(result)
+                elif available_count <= 2:
+                    risk_analysis['medium_risk'].append(result)
+                else:
+                    risk_analysis['low_risk'].append(result)
                     
-                    if available_count == 0:
-                        risk_analysis['unreachable'].append(result)
-                    elif high_risk_only:
-                        risk_analysis['high_risk'].append(result)
-                    elif available_count <= 2:
-                        risk_analysis['medium_risk'].append(result)
-                    else:
-                        risk_analysis['low_risk'].append(result)
-                        
-                except Exception as e:
-                    print(f"❌ Error testing CID {cid}: {str(e)}")
+            except Exception as e:
+                print(f"❌ Error testing CID {cid}: {str(e)}")
         
         # Calculate final gateway performance stats
         for gateway, stats in risk_analysis['gateway_performance'].items():
@@ -218,6 +471,9 @@ class IPFSGatewayTester:
             else:
                 stats['success_rate'] = 0
                 stats['avg_response_time'] = 0
+            health = self._gateway_health.get(gateway, {})
+            stats['ema_rt'] = health.get('ema_rt')
+            stats['consecutive_failures'] = health.get('consecutive_failures', 0)
         
         return {
             'individual_results': all_results,
@@ -256,7 +512,7 @@ class IPFSGatewayTester:
         sorted_gateways = sorted(performance.items(), key=lambda x: x[1]['success_rate'], reverse=True)
         
         for gateway, stats in sorted_gateways:
-            gateway_name = gateway.replace('https://', '').replace('/ipfs/', '')
+            gateway_name = self.display_name(gateway)
             success_rate = stats['success_rate'] * 100
             avg_time = stats['avg_response_time']
             
@@ -279,6 +535,15 @@ class IPFSGatewayTester:
         if summary['low_risk_count'] == summary['total_cids_tested']:
             print(f"   • ✅ All CIDs have good redundancy!")
 
+def write_results_json(path: str, results: Dict):
+    """Write results as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
 def generate_test_cids(count: int = 5) -> List[str]:
     """Generate some well-known test CIDs for demonstration."""
     known_test_cids = [
@@ -293,18 +558,27 @@ def generate_test_cids(count: int = 5) -> List[str]:
     return random.sample(known_test_cids, min(count, len(known_test_cids)))
 
 def main():
+    if sys.version_info < (3, 9):
+        print("❌ Python 3.9 or higher is required!")
+        print(f"💡 Current version: {sys.version}")
+        sys.exit(1)
+    
     parser = argparse.ArgumentParser(description="IPFS Gateway Risk Tester")
     parser.add_argument('--cids', type=str, help='Comma-separated list of CIDs to test')
     parser.add_argument('--file', type=str, help='File containing CIDs (one per line)')
     parser.add_argument('--random-test', type=int, help='Test N random well-known CIDs')
     parser.add_argument('--gateways', type=int, default=5, help='Number of random gateways to test (default: 5)')
     parser.add_argument('--timeout', type=int, default=10, help='Request timeout in seconds (default: 10)')
-    parser.add_argument('--workers', type=int, default=5, help='Max concurrent workers (default: 5)')
+    parser.add_argument('--workers', type=int, default=32, help='Max concurrent gateway probes (default: 32)')
     parser.add_argument('--output', type=str, help='Save detailed results to JSON file')
+    parser.add_argument('--fast-triage', action='store_true',
+                        help='Stop probing a CID once it is known to be low risk (faster, less gateway data)')
+    parser.add_argument('--cache-ttl', type=int, default=PROBE_CACHE_TTL,
+                        help=f'Reuse probe results younger than this many seconds (default: {PROBE_CACHE_TTL}, 0 to disable)')
     
     args = parser.parse_args()
     
-    tester = IPFSGatewayTester()
+    tester = IPFSGatewayTester(cache_ttl=args.cache_ttl)
     
     # Determine CIDs to test
     cids_to_test = []
@@ -325,6 +599,12 @@ def main():
         print("ℹ️  No CIDs specified. Testing 3 random well-known CIDs...")
         cids_to_test = generate_test_cids(3)
     
+    # Drop blanks and duplicates (order preserved) so no CID is probed twice
+    requested_count = len(cids_to_test)
+    cids_to_test = list(dict.fromkeys(cid.strip() for cid in cids_to_test if cid.strip()))
+    if len(cids_to_test) < requested_count:
+        print(f"ℹ️  Ignoring {requested_count - len(cids_to_test)} duplicate/empty CID entries")
+    
     if not cids_to_test:
         print("❌ No CIDs to test!")
         return
@@ -336,17 +616,20 @@ def main():
     results = tester.test_multiple_cids(
         cids_to_test, 
         selected_gateways, 
-        max_workers=args.workers
+        max_workers=args.workers,
+        timeout=args.timeout,
+        fast_triage=args.fast_triage
     )
     
+    tester.save_probe_cache()
+    
     # Print summary
     tester.print_risk_summary(results)
     
     # Save detailed results if requested
     if args.output:
         try:
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2)
+            write_results_json(args.output, results)
             print(f"\n💾 Detailed results saved to: {args.output}")
         except Exception as e:
             print(f"❌ Error saving results: {str(e)}")
@@ -1,11 +1,22 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
 import random
 import time
+import io
 import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from typing import List, Dict, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import utils  # Import our existing utils
 
 # Try to import plotly, but make it optional
@@ -17,6 +28,50 @@ try:
 except ImportError:
     PLOTLY_AVAILABLE = False
 
+# orjson is optional - it serializes large JSON reports several times faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx + h2 are optional - with them, concurrent probes to a gateway multiplex over a single
+# HTTP/2 connection instead of each needing its own HTTP/1.1 connection
+try:
+    import httpx
+    import h2  # noqa: F401 - needed by httpx for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+PROBE_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if HTTP2_AVAILABLE else ())
+PROBE_CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.TransportError,) if HTTP2_AVAILABLE else ())
+
+# Extraction diagnostics go through logging. The logger itself stays at DEBUG; levels live on
+# the handlers so no session changes what another one sees (the server console only gets warnings)
+logger = logging.getLogger(__name__)
+if not logger.handlers:  # The script module is re-executed on every rerun
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    logger.addHandler(console_handler)
+    logger.propagate = False
+logger.setLevel(logging.DEBUG)
+
+@contextmanager
+def capture_extraction_log():
+    """Collect this thread's DEBUG+ log records emitted inside the block into a StringIO (yielded) for display in the UI."""
+    buffer = io.StringIO()
+    handler = logging.StreamHandler(buffer)
+    handler.setLevel(logging.DEBUG)
+    # Each session runs its script on its own thread - don't pick up other sessions' extractions
+    thread_id = threading.get_ident()
+    handler.addFilter(lambda record: record.thread == thread_id)
+    logger.addHandler(handler)
+    try:
+        yield buffer
+    finally:
+        logger.removeHandler(handler)
+
 # Page configuration
 st.set_page_config(
     page_title="🌐 IPFS Gateway Risk Tester",
@@ -74,6 +129,176 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Ask for a single byte so a reachable CID answers 206 (or 200) without sending its body
+PROBE_HEADERS = {'Range': 'bytes=0-0'}
+
+# Same probe, but gateways that honour only-if-cached answer 412 at once instead of
+# starting a (possibly multi-second) network retrieval for content they don't hold
+ONLY_IF_CACHED_HEADERS = {**PROBE_HEADERS, 'Cache-Control': 'only-if-cached'}
+NOT_CACHED = "💤 Not cached (HTTP 412)"
+
+@st.cache_resource
+def get_gateway_session() -> requests.Session:
+    """
+    Keep-alive session shared by all probe threads and kept across Streamlit reruns,
+    so repeat probes to a gateway reuse its connection instead of a new TCP + TLS handshake.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)  # Plain-HTTP gateways get the same keep-alive pooling
+    return session
+
+@st.cache_resource
+def get_gateway_http2_client():
+    """HTTP/2 client used for probes instead of the session when httpx/h2 are installed (else None)."""
+    if not HTTP2_AVAILABLE:
+        return None
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+
+# Probe results are reused across reruns - re-analyzing the same wallet doesn't re-probe every gateway
+PROBE_CACHE_TTL = 300  # seconds
+
+# Minimum seconds between progress widget updates - each update is a websocket message to the browser
+PROGRESS_UPDATE_INTERVAL = 0.05
+
+# Concurrent 4everland pin API lookups (kept modest - it's an authenticated API, not a gateway)
+EVERLAND_API_WORKERS = 20
+
+@st.cache_resource
+def get_everland_api_session() -> requests.Session:
+    """
+    Pooled session for the 4everland pin API, sized for EVERLAND_API_WORKERS. Unlike gateway probes,
+    API calls retry rate limits (429) and transient 5xx with a short backoff, honouring Retry-After.
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=EVERLAND_API_WORKERS,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+    ))
+    return session
+
+# Cap on simultaneous probes to any one gateway, however many workers the run uses
+MAX_CONCURRENT_PER_GATEWAY = 8
+
+# After this many consecutive timeouts/connection errors a gateway's circuit opens for the rest of the run
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_OPEN = "⚡ Circuit open"
+CIRCUIT_FAILURE_STATUSES = ("⏰ Timeout", "🔌 Connection Error")
+
+# Status recorded for public-gateway probes cancelled once a CID's low-risk bucket is already certain
+SKIPPED_CLASSIFIED = "⏭️ Skipped (already classified)"
+
+# Results recorded without a network probe (excluded from probe cache telemetry)
+UNPROBED_STATUSES = (CIRCUIT_OPEN, SKIPPED_CLASSIFIED)
+
+# Incremented only when _probe_cached actually runs (a cache miss); read to derive the hit count
+_probe_miss_count = 0
+_probe_miss_lock = threading.Lock()
+
+# Gateways that 301 every path-style request (/ipfs/<cid>) to subdomain form (<cid>.ipfs.<host>);
+# probing the subdomain URL directly saves that redirect round trip
+SUBDOMAIN_GATEWAY_HOSTS = frozenset({"dweb.link", "nftstorage.link", "w3s.link"})
+
+def _probe_url(gateway_url: str, cid: str) -> str:
+    """URL to probe for a CID: subdomain form where the gateway would redirect to it anyway."""
+    host = urlparse(gateway_url).hostname
+    root, _, path = cid.partition('/')
+    # Subdomain labels must be case-insensitive, so only base32 CIDv1 can go there directly
+    if host in SUBDOMAIN_GATEWAY_HOSTS and root.startswith('b'):
+        return f"https://{root}.ipfs.{host}/{path}"
+    return f"{gateway_url}{cid}"
+
+def _gateway_label(gateway_url: str) -> str:
+    """Short display name for a gateway: "https://ipfs.io/ipfs/" -> "ipfs.io"."""
+    return gateway_url.removeprefix('https://').removesuffix('/ipfs/')
+
+class ProbeTransportError(Exception):
+    """A probe that got no HTTP answer (timeout, connection or other error) - carries its status and time."""
+    def __init__(self, status: str, response_time: float):
+        super().__init__(status)
+        self.status = status
+        self.response_time = response_time
+
+@st.cache_data(ttl=PROBE_CACHE_TTL, max_entries=10_000, show_spinner=False)
+def _probe_cached(gateway_url: str, cid: str, timeout: int, only_if_cached: bool = False) -> Tuple[bool, str, float]:
+    """
+    Probe a CID on a gateway. Memoized per (gateway, cid, timeout, only_if_cached) by st.cache_data.
+    With only_if_cached, a gateway that doesn't already hold the CID reports NOT_CACHED.
+    Raises ProbeTransportError when the gateway gave no HTTP answer, so such failures are never cached.
+    """
+    global _probe_miss_count
+    with _probe_miss_lock:
+        _probe_miss_count += 1
+    
+    start_time = time.perf_counter()
+    try:
+        url = _probe_url(gateway_url, cid)
+        # Ranged GET instead of HEAD: many gateways answer HEAD with 405/501 (false "unavailable");
+        # streaming the first byte only and closing gives the same latency signal
+        headers = ONLY_IF_CACHED_HEADERS if only_if_cached else PROBE_HEADERS
+        http2_client = get_gateway_http2_client()
+        if http2_client is not None:
+            with http2_client.stream('GET', url, headers=headers, timeout=timeout) as response:
+                pass
+        else:
+            response = get_gateway_session().get(url, headers=headers, stream=True,
+                                                 timeout=timeout, allow_redirects=True)
+            response.close()
+        
+        if response.status_code in (200, 206):
+            is_available, status = True, f"✅ Available (HTTP {response.status_code})"
+        elif response.status_code == 412 and only_if_cached:
+            is_available, status = False, NOT_CACHED
+        else:
+            is_available, status = False, f"❌ HTTP {response.status_code}"
+            
+    except PROBE_TIMEOUT_ERRORS:
+        status = "⏰ Timeout"
+    except PROBE_CONNECTION_ERRORS:
+        status = "🔌 Connection Error"
+    except Exception as e:
+        status = f"❌ Error: {str(e)[:50]}"
+    else:
+        return is_available, status, time.perf_counter() - start_time
+    
+    raise ProbeTransportError(status, time.perf_counter() - start_time)
+
+# CIDv0 (base58 "Qm...") or base32 CIDv1 ("b..."), optionally followed by a path inside the DAG
+_CID_RE = re.compile(r'^(Qm[1-9A-HJ-NP-Za-km-z]{44}|b[A-Za-z2-7]{58,})(/.*)?$')
+
+# Asset URL schemes that point straight at IPFS (ARC-3 style and ARC-19 templates)
+_IPFS_URL_PREFIXES = ('ipfs://', 'template-ipfs://')
+
+# Wallet asset lists are reused across reruns - re-analyzing a wallet skips the indexer pagination
+WALLET_ASSETS_CACHE_TTL = 600  # seconds
+
+@st.cache_data(ttl=WALLET_ASSETS_CACHE_TTL, show_spinner=False)
+def _cached_creator_assets(wallet_address: str) -> List[dict]:
+    """Fetch a wallet's assets. Raises RuntimeError on failure so errors are never cached."""
+    assets, error = utils.get_all_creator_assets(wallet_address)
+    if error:
+        raise RuntimeError(error)
+    return assets
+
+def get_wallet_assets(wallet_address: str) -> Tuple[List[dict], str]:
+    """Cached utils.get_all_creator_assets. Returns: (list_of_assets, error_message)"""
+    try:
+        return _cached_creator_assets(wallet_address), None
+    except RuntimeError as e:
+        return [], str(e)
+
 class IPFSGatewayTesterUI:
     def __init__(self):
         # Comprehensive list organized by risk level
@@ -125,39 +350,72 @@ class IPFSGatewayTesterUI:
             self.gateway_types[gw] = "old_web3_storage"
         for gw in self.other_public_gateways:
             self.gateway_types[gw] = "other_public"
+        
+        # Per-run circuit breaker state (reset by test_multiple_cids_with_progress)
+        self._failure_counts = defaultdict(int)
+        self._open_circuits = set()
+        self._circuit_lock = threading.Lock()
+        
+        # Per-gateway probe slots (rebuilt for each run's gateways)
+        self._gateway_slots = {}
 
     def select_random_gateways(self, count: int = 5) -> List[str]:
         """Select random gateways for testing."""
         return random.sample(self.all_gateways, min(count, len(self.all_gateways)))
 
-    def test_gateway_availability(self, gateway_url: str, cid: str, timeout: int = 10) -> Tuple[bool, str, float]:
-        """Test if a CID is available through a specific IPFS gateway."""
-        start_time = time.time()
-        try:
-            url = f"{gateway_url}{cid}"
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
-            response_time = time.time() - start_time
-            
-            if response.status_code == 200:
-                return True, f"✅ Available (HTTP {response.status_code})", response_time
+    def test_gateway_availability(self, gateway_url: str, cid: str, timeout: int = 10,
+                                  only_if_cached: bool = False) -> Tuple[bool, str, float]:
+        """
+        Test if a CID is available through a specific IPFS gateway (cached for PROBE_CACHE_TTL seconds).
+        With only_if_cached, content the gateway doesn't already hold answers NOT_CACHED (a quick
+        pre-check - callers must re-probe those with a full fetch before calling them unavailable).
+        Gateways whose circuit is open fail immediately without touching the network.
+        """
+        if gateway_url in self._open_circuits:
+            return False, CIRCUIT_OPEN, 0.0
+        
+        with self._gateway_slots.get(gateway_url) or nullcontext():
+            try:
+                result = _probe_cached(gateway_url, cid, timeout, only_if_cached)
+            except ProbeTransportError as e:
+                result = (False, e.status, e.response_time)
+        with self._circuit_lock:
+            if result[1] in CIRCUIT_FAILURE_STATUSES:
+                self._failure_counts[gateway_url] += 1
+                if self._failure_counts[gateway_url] >= CIRCUIT_BREAKER_THRESHOLD:
+                    self._open_circuits.add(gateway_url)
             else:
-                return False, f"❌ HTTP {response.status_code}", response_time
-                
-        except requests.exceptions.Timeout:
-            response_time = time.time() - start_time
-            return False, "⏰ Timeout", response_time
-        except requests.exceptions.ConnectionError:
-            response_time = time.time() - start_time
-            return False, "🔌 Connection Error", response_time
-        except Exception as e:
-            response_time = time.time() - start_time
-            return False, f"❌ Error: {str(e)[:50]}", response_time
+                self._failure_counts[gateway_url] = 0
+        return result
 
-    def test_multiple_cids_with_progress(self, cids: List[str], gateways: List[str], progress_bar, status_text) -> Dict:
-        """Enhanced testing with proper risk assessment and shutdown analysis."""
+    def test_multiple_cids_with_progress(self, cids: List[str], gateways: List[str], progress_bar, status_text,
+                                         max_workers: int = None, early_exit: bool = True,
+                                         cached_precheck: bool = False) -> Dict:
+        """
+        Enhanced testing with proper risk assessment and shutdown analysis.
+        All (CID, gateway) probes run concurrently; progress updates as each one completes.
+        max_workers defaults to len(gateways) * min(len(cids), 8), capped at 64.
+        With early_exit, once a CID is on 2+ pinning services and a reliable public gateway, its
+        not-yet-started public gateway probes are cancelled and recorded as SKIPPED_CLASSIFIED.
+        Pinning service and old.web3.storage probes always run (service stats / shutdown analysis);
+        the classifying probes are queued first so the early exit can cancel more of the rest.
+        With cached_precheck, the first pass asks only for content gateways already hold
+        (Cache-Control: only-if-cached, no slow retrievals) and every NOT_CACHED answer is then
+        probed again with a full fetch, so availability means the same thing either way.
+        Duplicate CIDs are probed once; individual_results still has one entry per requested CID.
+        """
+        requested_cids = cids
+        cids = list(dict.fromkeys(cids))
         total_tests = len(cids) * len(gateways)
         completed_tests = 0
         
+        # Gateway classification looked up once per gateway, not once per (CID, gateway) probe
+        gateway_type_of = {gateway: self.gateway_types.get(gateway, "unknown") for gateway in gateways}
+        gateway_info = [(gateway, gateway_type_of[gateway], self.pinning_service_gateways.get(gateway, "Unknown"))
+                        for gateway in gateways]
+        if max_workers is None:
+            max_workers = min(64, len(gateways) * min(len(cids), 8))
+        
         all_results = []
         risk_analysis = {
             'high_risk': [],
@@ -168,16 +426,6 @@ class IPFSGatewayTesterUI:
             'pinning_services': {}
         }
         
-        # Initialize gateway performance tracking
-        for gateway in gateways:
-            risk_analysis['gateway_performance'][gateway] = {
-                'success_count': 0,
-                'total_tests': 0,
-                'avg_response_time': 0,
-                'total_response_time': 0,
-                'successful_cids': []
-            }
-        
         # Initialize pinning service tracking
         for gateway, service_name in self.pinning_service_gateways.items():
             if gateway in gateways:
@@ -187,9 +435,93 @@ class IPFSGatewayTesterUI:
                     'success_rate': 0
                 }
         
-        for i, cid in enumerate(cids):
-            status_text.text(f"🔍 Testing CID {i+1}/{len(cids)}: {cid[:20]}...")
+        # Fan out every probe at once - wall time tracks the slowest gateway, not the sum
+        with self._circuit_lock:
+            self._failure_counts.clear()
+            self._open_circuits.clear()
+        self._gateway_slots = {gateway: threading.BoundedSemaphore(MAX_CONCURRENT_PER_GATEWAY) for gateway in gateways}
+        
+        probe_results = {}
+        uncached_pairs = []
+        skipped_tests = 0
+        misses_before = _probe_miss_count
+        if total_tests:
+            status_text.text(f"🔍 Testing {len(cids)} CIDs across {len(gateways)} gateways...")
+            # Only public gateways can be skipped - they can no longer change a low-risk verdict
+            skippable_gateways = [g for g in gateways
+                                  if gateway_type_of[g] not in ("pinning_service", "old_web3_storage")]
+            pinning_hits = dict.fromkeys(cids, 0)
+            reliable_hits = dict.fromkeys(cids, 0)
+            classified = set()
             
+            # Queue the probes that can classify a CID (pinning services, reliable public) ahead of the
+            # rest, so the early exit fires while most skippable probes are still queued and cancellable
+            # (CID-major within each tier keeps the per-gateway slots from stalling the workers)
+            deciding_gateways = [g for g in gateways
+                                 if gateway_type_of[g] in ("pinning_service", "reliable_public")]
+            remaining_gateways = [g for g in gateways if g not in deciding_gateways]
+            with ThreadPoolExecutor(max_workers=min(max_workers, total_tests)) as executor:
+                pair_to_future = {
+                    (cid, gateway): executor.submit(self.test_gateway_availability, gateway, cid, 8,
+                                                   only_if_cached=cached_precheck)
+                    for tier in (deciding_gateways, remaining_gateways) for cid in cids for gateway in tier
+                }
+                future_to_pair = {future: pair for pair, future in pair_to_future.items()}
+                last_update = time.monotonic()
+                # Streamlit elements are only touched from this (the script) thread
+                for future in as_completed(future_to_pair):
+                    if future.cancelled():
+                        continue  # Already recorded as skipped
+                    cid, gateway = future_to_pair[future]
+                    probe_results[(cid, gateway)] = future.result()
+                    completed_tests += 1
+                    
+                    if early_exit and probe_results[(cid, gateway)][0] and cid not in classified:
+                        gateway_type = gateway_type_of[gateway]
+                        if gateway_type == "pinning_service":
+                            pinning_hits[cid] += 1
+                        elif gateway_type == "reliable_public":
+                            reliable_hits[cid] += 1
+                        
+                        if pinning_hits[cid] >= 2 and reliable_hits[cid] >= 1:
+                            classified.add(cid)
+                            for other_gateway in skippable_gateways:
+                                pending = pair_to_future.get((cid, other_gateway))
+                                if pending is not None and pending.cancel():
+                                    probe_results[(cid, other_gateway)] = (False, SKIPPED_CLASSIFIED, 0.0)
+                                    completed_tests += 1
+                                    skipped_tests += 1
+                    
+                    # Coalesce updates to at most one per PROGRESS_UPDATE_INTERVAL (always show the last one)
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL or completed_tests == total_tests:
+                        last_update = now
+                        progress_bar.progress(completed_tests / total_tests)
+                        status_text.text(f"🔍 Completed {completed_tests}/{total_tests} gateway tests...")
+            
+            if cached_precheck:
+                uncached_pairs = [pair for pair, result in probe_results.items() if result[1] == NOT_CACHED]
+            if uncached_pairs:
+                status_text.text(f"🔁 Re-checking {len(uncached_pairs)} uncached probes with a full fetch...")
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(uncached_pairs))) as executor:
+                    rechecked = executor.map(
+                        lambda pair: self.test_gateway_availability(pair[1], pair[0], 8, only_if_cached=False),
+                        uncached_pairs
+                    )
+                    probe_results.update(zip(uncached_pairs, rechecked))
+        
+        # Session-wide cache telemetry (session_state is only safe to touch from the script thread)
+        probe_misses = _probe_miss_count - misses_before
+        probes_run = sum(1 for _, status, _ in probe_results.values() if status not in UNPROBED_STATUSES)
+        probes_run += len(uncached_pairs)
+        st.session_state['probe_hits'] = st.session_state.get('probe_hits', 0) + probes_run - probe_misses
+        st.session_state['probe_misses'] = st.session_state.get('probe_misses', 0) + probe_misses
+        
+        # Flat (gateway, cid, gateway_type, is_available, response_time) rows - aggregated per
+        # gateway and per CID with vectorized pandas passes below
+        probe_records = []
+        
+        for cid in cids:
             cid_result = {
                 'cid': cid,
                 'gateway_results': {},
@@ -202,16 +534,14 @@ class IPFSGatewayTesterUI:
                     'reliable_public_count': 0,
                     'fastest_gateway': None,
                     'fastest_time': float('inf'),
-                    'network_available': False
+                    'network_available': False,
+                    'skipped_count': 0
                 }
             }
             
-            # Test each gateway for this CID
-            for gateway in gateways:
-                is_available, status, response_time = self.test_gateway_availability(gateway, cid, timeout=8)
-                
-                # FIXED: Use dictionary lookup instead of list.get()
-                gateway_type = self.gateway_types.get(gateway, "unknown")
+            # Collect this CID's probe results
+            for gateway, gateway_type, service_name in gateway_info:
+                is_available, status, response_time = probe_results[(cid, gateway)]
                 
                 cid_result['gateway_results'][gateway] = {
                     'available': is_available,
@@ -220,61 +550,74 @@ class IPFSGatewayTesterUI:
                     'gateway_type': gateway_type
                 }
                 
-                # Update gateway performance stats
-                stats = risk_analysis['gateway_performance'][gateway]
-                stats['total_tests'] += 1
-                stats['total_response_time'] += response_time
+                # Skipped probes say nothing about the gateway - keep them out of its performance stats
+                if status == SKIPPED_CLASSIFIED:
+                    cid_result['summary']['skipped_count'] += 1
+                    continue
                 
-                if is_available:
-                    cid_result['summary']['available_count'] += 1
-                    cid_result['summary']['network_available'] = True
-                    stats['success_count'] += 1
-                    stats['successful_cids'].append(cid)
-                    
-                    # Categorize by gateway type
-                    if gateway_type == "pinning_service":
-                        cid_result['summary']['pinning_service_count'] += 1
-                        service_name = self.pinning_service_gateways.get(gateway, "Unknown")
-                        cid_result['pinning_services_available'].append(service_name)
-                        risk_analysis['pinning_services'][service_name]['available_cids'].append(cid)
-                    elif gateway_type == "old_web3_storage":
-                        cid_result['summary']['old_web3_storage_count'] += 1
-                    elif gateway_type == "reliable_public":
-                        cid_result['summary']['reliable_public_count'] += 1
-                    
-                    if response_time < cid_result['summary']['fastest_time']:
-                        cid_result['summary']['fastest_time'] = response_time
-                        cid_result['summary']['fastest_gateway'] = gateway
+                probe_records.append((gateway, cid, gateway_type, is_available, response_time))
                 
-                completed_tests += 1
-                progress_bar.progress(completed_tests / total_tests)
-            
-            # Risk assessment based on actual storage guarantees
-            pinning_count = cid_result['summary']['pinning_service_count']
-            old_web3_count = cid_result['summary']['old_web3_storage_count']
-            network_available = cid_result['summary']['network_available']
-            
-            if not network_available:
-                risk_analysis['unreachable'].append(cid_result)
-            elif pinning_count == 0 and old_web3_count > 0:
-                risk_analysis['high_risk'].append(cid_result)  # Only on shutting-down services
-            elif pinning_count == 0:
-                risk_analysis['high_risk'].append(cid_result)  # No confirmed pinning services
-            elif pinning_count == 1:
-                risk_analysis['medium_risk'].append(cid_result)  # Single point of failure
-            else:
-                risk_analysis['low_risk'].append(cid_result)  # Good redundancy
+                if is_available and gateway_type == "pinning_service":
+                    cid_result['pinning_services_available'].append(service_name)
+                    risk_analysis['pinning_services'][service_name]['available_cids'].append(cid)
             
             all_results.append(cid_result)
         
-        # Calculate final gateway performance stats
-        for gateway, stats in risk_analysis['gateway_performance'].items():
-            if stats['total_tests'] > 0:
-                stats['success_rate'] = stats['success_count'] / stats['total_tests']
-                stats['avg_response_time'] = stats['total_response_time'] / stats['total_tests']
-            else:
-                stats['success_rate'] = 0
-                stats['avg_response_time'] = 0
+        probes_df = pd.DataFrame.from_records(
+            probe_records, columns=['gateway', 'cid', 'gateway_type', 'is_available', 'response_time']
+        ).astype({'is_available': bool, 'response_time': float})
+        available_df = probes_df[probes_df['is_available']]
+        
+        # Per-CID availability counts by gateway type, and each CID's fastest available gateway
+        type_counts = (available_df.groupby(['cid', 'gateway_type']).size()
+                       .unstack(fill_value=0)
+                       .reindex(index=cids, columns=['pinning_service', 'old_web3_storage', 'reliable_public'],
+                                fill_value=0))
+        available_counts = available_df.groupby('cid').size().reindex(cids, fill_value=0)
+        fastest = available_df.loc[available_df.groupby('cid')['response_time'].idxmin()].set_index('cid')
+        
+        # Risk assessment based on actual storage guarantees, for every CID at once:
+        # nowhere -> unreachable, no pinning service -> high (incl. only on shutting-down services),
+        # single pinning service -> medium (single point of failure), 2+ -> low (good redundancy)
+        pinning_counts = type_counts['pinning_service'].to_numpy()
+        risk_buckets = np.select(
+            [available_counts.to_numpy() == 0, pinning_counts == 0, pinning_counts == 1],
+            ['unreachable', 'high_risk', 'medium_risk'],
+            default='low_risk'
+        )
+        
+        for cid_result, bucket, available_count, (pinning_count, old_web3_count, reliable_count) in zip(
+                all_results, risk_buckets, available_counts.to_numpy(), type_counts.to_numpy()):
+            summary = cid_result['summary']
+            summary['available_count'] = int(available_count)
+            summary['network_available'] = bool(available_count)
+            summary['pinning_service_count'] = int(pinning_count)
+            summary['old_web3_storage_count'] = int(old_web3_count)
+            summary['reliable_public_count'] = int(reliable_count)
+            if cid_result['cid'] in fastest.index:
+                summary['fastest_gateway'] = fastest.at[cid_result['cid'], 'gateway']
+                summary['fastest_time'] = float(fastest.at[cid_result['cid'], 'response_time'])
+            risk_analysis[bucket].append(cid_result)
+        
+        # Calculate final gateway performance stats with one groupby instead of per-probe dict updates
+        gateway_stats = probes_df.groupby('gateway').agg(
+            success_count=('is_available', 'sum'),
+            total_tests=('is_available', 'size'),
+            success_rate=('is_available', 'mean'),
+            total_response_time=('response_time', 'sum'),
+            avg_response_time=('response_time', 'mean')
+        ).reindex(gateways).dropna(subset=['total_tests'])  # Gateways whose probes were all skipped have no stats
+        successful_cids = available_df.groupby('gateway')['cid'].agg(list)
+        
+        for gateway, row in gateway_stats.iterrows():
+            risk_analysis['gateway_performance'][gateway] = {
+                'success_count': int(row['success_count']),
+                'total_tests': int(row['total_tests']),
+                'success_rate': float(row['success_rate']),
+                'avg_response_time': float(row['avg_response_time']),
+                'total_response_time': float(row['total_response_time']),
+                'successful_cids': successful_cids.get(gateway, [])
+            }
         
         # Calculate pinning service stats
         for service_name, service_stats in risk_analysis['pinning_services'].items():
@@ -282,8 +625,15 @@ class IPFSGatewayTesterUI:
             if service_stats['total_tested'] > 0:
                 service_stats['success_rate'] = len(service_stats['available_cids']) / service_stats['total_tested']
         
+        # Every requested CID gets its (shared) result back, duplicates included
+        individual_results = all_results
+        if len(cids) < len(requested_cids):
+            results_by_cid = {result['cid']: result for result in all_results}
+            individual_results = [results_by_cid[cid] for cid in requested_cids]
+        
         return {
-            'individual_results': all_results,
+            'individual_results': individual_results,
+            'probes': probes_df,  # Flat per-probe table for charts (left out of the JSON export)
             'risk_analysis': risk_analysis,
             'summary': {
                 'total_cids_tested': len(cids),
@@ -292,7 +642,8 @@ class IPFSGatewayTesterUI:
                 'medium_risk_count': len(risk_analysis['medium_risk']),
                 'low_risk_count': len(risk_analysis['low_risk']),
                 'unreachable_count': len(risk_analysis['unreachable']),
-                'pinning_services_tested': list(risk_analysis['pinning_services'].keys())
+                'pinning_services_tested': list(risk_analysis['pinning_services'].keys()),
+                'skipped_tests': skipped_tests
             }
         }
 
@@ -307,14 +658,15 @@ class IPFSGatewayTesterUI:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(
-                f"https://api.4everland.dev/pins?cid={cid}",
+            response = get_everland_api_session().get(
+                "https://api.4everland.dev/pins",
+                params={'cid': cid},
                 headers=headers,
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
                 pins = data.get('results', [])
                 for pin in pins:
                     if pin.get('pin', {}).get('cid') == cid and pin.get('status') == 'pinned':
@@ -326,6 +678,17 @@ class IPFSGatewayTesterUI:
         except Exception as e:
             return False, f"❌ Error: {str(e)[:50]}"
 
+    def check_4everland_batch(self, cids: List[str], api_key: str) -> Dict[str, Tuple[bool, str]]:
+        """
+        Check many CIDs on 4everland concurrently (EVERLAND_API_WORKERS at a time) over the pooled session.
+        Returns: dict {cid: (is_pinned, status)}
+        """
+        cids = list(dict.fromkeys(cids))  # One API call per distinct CID
+        if not cids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(EVERLAND_API_WORKERS, len(cids))) as executor:
+            return dict(zip(cids, executor.map(lambda cid: self.check_4everland_via_api(cid, api_key), cids)))
+
     def analyze_shutdown_risk(self, cid_results: List[Dict]) -> Dict:
         """Analyze old.web3.storage shutdown risk."""
         shutdown_analysis = {
@@ -335,6 +698,8 @@ class IPFSGatewayTesterUI:
             'unreachable': []        # Not available anywhere
         }
         
+        old_web3_services = self.old_web3_storage_gateways  # Hoisted out of the per-CID loop
+        
         for result in cid_results:
             # Check availability on different gateway types
             old_web3_available = []
@@ -342,8 +707,8 @@ class IPFSGatewayTesterUI:
             
             for gateway, gw_result in result['gateway_results'].items():
                 if gw_result['available']:
-                    if gateway in self.old_web3_storage_gateways:
-                        service_name = self.old_web3_storage_gateways[gateway]
+                    service_name = old_web3_services.get(gateway)
+                    if service_name is not None:
                         old_web3_available.append(service_name)
                     else:
                         other_available.append(gateway)
@@ -367,17 +732,25 @@ class IPFSGatewayTesterUI:
         
         return shutdown_analysis
 
+@st.cache_data(ttl=WALLET_ASSETS_CACHE_TTL, show_spinner=False)
 def extract_cids_from_assets(assets: List[dict]) -> List[str]:
-    """Enhanced CID extraction with better debugging and filtering."""
+    """
+    Enhanced CID extraction with better debugging and filtering.
+    Cached per asset list, so re-analyzing the same assets skips extraction and metadata fetches.
+    """
     cids = []
     successful_extractions = 0
     failed_extractions = 0
     
-    print(f"🔍 DEBUG: Starting CID extraction from {len(assets)} assets...")
+    logger.debug("🔍 Starting CID extraction from %d assets...", len(assets))
+    
+    # ARC-19 assets whose metadata must be fetched for the image CID: (asset_id, metadata_cid)
+    arc19_candidates = []
     
     for asset in assets:
         asset_id = asset.get('index', 'Unknown')
-        asset_name = asset.get('params', {}).get('name', 'Unknown')
+        asset_params = asset.get('params', {})
+        asset_name = asset_params.get('name', 'Unknown')
         
         try:
             # Try metadata CID first
@@ -386,41 +759,47 @@ def extract_cids_from_assets(assets: List[dict]) -> List[str]:
             if metadata_cid:
                 cids.append(metadata_cid)
                 successful_extractions += 1
-                print(f"✅ Asset {asset_id} ({asset_name}): {metadata_cid[:20]}...")
+                logger.debug("✅ Asset %s (%s): %.20s...", asset_id, asset_name, metadata_cid)
                 
-                # For ARC-19, also try to get image CID
-                asset_params = asset.get('params', {})
-                arc_standard = utils.detect_arc_standard(asset_params)
-                
-                if arc_standard == 'arc19':
-                    try:
-                        image_cid, _ = utils.fetch_metadata_and_extract_image_cid(metadata_cid)
-                        if image_cid and image_cid != metadata_cid:
-                            cids.append(image_cid)
-                            print(f"🖼️ Asset {asset_id} image CID: {image_cid[:20]}...")
-                    except Exception as e:
-                        print(f"⚠️ Failed to fetch image CID for {asset_id}: {str(e)}")
+                # For ARC-19, also get the image CID (fetched concurrently below)
+                if utils.detect_arc_standard(asset_params) == 'arc19':
+                    arc19_candidates.append((asset_id, metadata_cid))
             else:
                 failed_extractions += 1
                 # Debug why extraction failed
-                asset_params = asset.get('params', {})
                 url = asset_params.get('url', '')
                 reserve = asset_params.get('reserve', '')
                 
-                print(f"❌ Asset {asset_id} ({asset_name}): No CID extracted")
-                print(f"   URL: {url[:50] if url else 'None'}...")
-                print(f"   Reserve: {'Present' if reserve else 'None'}")
-                print(f"   Deleted: {asset.get('deleted', False)}")
+                logger.debug("❌ Asset %s (%s): No CID extracted\n   URL: %.50s...\n   Reserve: %s\n   Deleted: %s",
+                             asset_id, asset_name, url or 'None', 'Present' if reserve else 'None',
+                             asset.get('deleted', False))
                 
         except Exception as e:
             failed_extractions += 1
-            print(f"❌ Error processing asset {asset_id}: {str(e)}")
+            logger.warning("❌ Error processing asset %s: %s", asset_id, e)
+    
+    # Fetch all ARC-19 metadata at once instead of one blocking IPFS fetch per asset;
+    # the lookups below are then served from the utils metadata cache
+    if arc19_candidates:
+        utils.prefetch_metadata([metadata_cid for _, metadata_cid in arc19_candidates])
+    
+    for asset_id, metadata_cid in arc19_candidates:
+        try:
+            image_cid, _, _ = utils.fetch_metadata_and_extract_image_cid(metadata_cid)
+            if image_cid and image_cid != metadata_cid:
+                cids.append(image_cid)
+                logger.debug("🖼️ Asset %s image CID: %.20s...", asset_id, image_cid)
+        except Exception as e:
+            logger.warning("⚠️ Failed to fetch image CID for %s: %s", asset_id, e)
     
-    unique_cids = list(set(cids))  # Remove duplicates
-    print(f"📊 Extraction Summary:")
-    print(f"   ✅ Successful: {successful_extractions}")
-    print(f"   ❌ Failed: {failed_extractions}")
-    print(f"   🎯 Unique CIDs: {len(unique_cids)}")
+    # Drop malformed CIDs before they turn into wasted gateway probes
+    valid_cids = [c for c in cids if _CID_RE.match(c)]
+    if len(valid_cids) < len(cids):
+        logger.warning("⚠️ Dropped %d malformed CIDs", len(cids) - len(valid_cids))
+    
+    unique_cids = list(dict.fromkeys(valid_cids))  # Remove duplicates, keeping extraction order
+    logger.debug("📊 Extraction Summary:\n   ✅ Successful: %d\n   ❌ Failed: %d\n   🎯 Unique CIDs: %d",
+                 successful_extractions, failed_extractions, len(unique_cids))
     
     return unique_cids
 
@@ -450,6 +829,7 @@ def sample_assets_strategically(assets: List[dict], sample_size: int = 5) -> Lis
         return valid_assets
     
     sampled = []
+    chosen_ids = set()  # id() of every sampled asset - overlapping segments never pick twice
     total = len(valid_assets)
     
     # Take from different segments for diversity
@@ -466,15 +846,13 @@ def sample_assets_strategically(assets: List[dict], sample_size: int = 5) -> Lis
     # Sample one from each segment
     for i, (start, end) in enumerate(segments):
         if len(sampled) < sample_size and start < total:
-            segment_assets = valid_assets[start:min(end, total)]
+            segment_assets = [a for a in valid_assets[start:min(end, total)] if id(a) not in chosen_ids]
             if segment_assets:
                 # Try to pick an asset that's likely to have a CID
                 selected = None
                 for asset in segment_assets:
-                    asset_params = asset.get('params', {})
-                    url = asset_params.get('url', '')
                     # Prioritize assets with IPFS URLs or template URLs
-                    if url.startswith('ipfs://') or url.startswith('template-ipfs://'):
+                    if asset.get('params', {}).get('url', '').startswith(_IPFS_URL_PREFIXES):
                         selected = asset
                         break
                 
@@ -482,17 +860,18 @@ def sample_assets_strategically(assets: List[dict], sample_size: int = 5) -> Lis
                     selected = random.choice(segment_assets)
                 
                 sampled.append(selected)
+                chosen_ids.add(id(selected))
                 asset_name = selected.get('params', {}).get('name', 'Unknown')
                 asset_id = selected.get('index', 'Unknown')
                 print(f"   Segment {i+1}: Asset {asset_id} ({asset_name})")
     
     # Fill remaining slots with random samples from different areas
-    remaining_assets = [a for a in valid_assets if a not in sampled]
-    while len(sampled) < sample_size and remaining_assets:
-        # Pick randomly but try to avoid clustering
-        random_asset = random.choice(remaining_assets)
+    # (identity set + one random.sample over indices: O(n + k) instead of list scans/removes)
+    pool = [i for i, a in enumerate(valid_assets) if id(a) not in chosen_ids]
+    extra = random.sample(pool, min(sample_size - len(sampled), len(pool)))
+    for index in extra:
+        random_asset = valid_assets[index]
         sampled.append(random_asset)
-        remaining_assets.remove(random_asset)
         
         asset_name = random_asset.get('params', {}).get('name', 'Unknown')
         asset_id = random_asset.get('index', 'Unknown')
@@ -517,21 +896,15 @@ def create_simple_charts(results):
     # Gateway type availability
     st.markdown("### 🌐 Gateway Type Analysis")
     
-    # Aggregate gateway type stats
+    # CIDs available on at least one gateway of each type, straight from the flat probe table
+    probes_df = results['probes']
+    available_per_type = probes_df[probes_df['is_available']].groupby('gateway_type')['cid'].nunique()
     type_stats = {
-        'Pinning Services': 0,
-        'Public Access': 0,
-        'Deprecated': 0
+        'Pinning Services': int(available_per_type.get('pinning_service', 0)),
+        'Public Access': int(available_per_type.get('reliable_public', 0)),
+        'Deprecated': int(available_per_type.get('old_web3_storage', 0))
     }
     
-    for result in results['individual_results']:
-        if result['summary']['pinning_service_count'] > 0:
-            type_stats['Pinning Services'] += 1
-        if result['summary']['old_web3_storage_count'] > 0:
-            type_stats['Deprecated'] += 1
-        if result['summary']['reliable_public_count'] > 0:
-            type_stats['Public Access'] += 1
-    
     st.bar_chart(type_stats)
 
 def create_plotly_charts(results):
@@ -568,7 +941,7 @@ def create_plotly_charts(results):
     st.markdown("### 🌐 Gateway Performance")
     
     perf_data = results['risk_analysis']['gateway_performance']
-    gateway_names = [gw.replace('https://', '').replace('/ipfs/', '') for gw in perf_data.keys()]
+    gateway_names = [_gateway_label(gw) for gw in perf_data]
     success_rates = [stats['success_rate'] * 100 for stats in perf_data.values()]
     response_times = [stats['avg_response_time'] for stats in perf_data.values()]
     
@@ -598,6 +971,18 @@ def create_plotly_charts(results):
     fig.update_xaxes(tickangle=45)
     st.plotly_chart(fig, use_container_width=True)
 
+# Badge shown next to each selected gateway, by gateway type (pinning services name their service)
+GATEWAY_TYPE_BADGES = {
+    "old_web3_storage": "🚨 OLD.WEB3.STORAGE (SHUTTING DOWN)",
+    "reliable_public": "🟢 RELIABLE PUBLIC",
+}
+
+# Result table layouts - rows are built as tuples in this column order
+SHUTDOWN_TABLE_COLUMNS = ('CID', 'Shutdown Risk', 'Old.Web3.Storage', 'Other Sources', 'Action Needed')
+DETAIL_TABLE_COLUMNS = ('CID', 'Risk Level', 'Risk Detail', 'Pinning Services', 'Network Available', 'Total Gateways')
+DETAIL_RAW_COLUMNS = ('CID', 'Pinning Services', 'network_available', 'pinning_count', 'old_web3_count',
+                      'available_count')
+
 def main():
     st.markdown('<h1 class="main-header">🌐 IPFS Gateway Risk Tester 🛡️</h1>', unsafe_allow_html=True)
     
@@ -605,13 +990,37 @@ def main():
     if not PLOTLY_AVAILABLE:
         st.info("📊 Using simplified charts (plotly not installed). Install plotly for enhanced visualizations.")
     
-    tester = IPFSGatewayTesterUI()
+    # Build the tester once per browser session rather than on every widget interaction.
+    # (session_state, not st.cache_resource: the tester holds per-run circuit breaker state
+    # that must not be shared between concurrent users)
+    if 'tester' not in st.session_state:
+        st.session_state['tester'] = IPFSGatewayTesterUI()
+    tester = st.session_state['tester']
     
     # Sidebar configuration
     st.sidebar.markdown("## ⚙️ Configuration")
     
     num_gateways = st.sidebar.slider("🌐 Number of gateways to test", 5, 15, 10)
     
+    max_concurrent_tests = st.sidebar.slider(
+        "⚡ Concurrent gateway tests", 4, 64, 32,
+        help="How many gateway requests run at once - lower it on slow or metered connections"
+    )
+    
+    thorough_mode = st.sidebar.checkbox(
+        "🔬 Thorough mode (probe every gateway)",
+        value=False,
+        help="By default a CID stops being probed once it is on 2+ pinning services and a reliable "
+             "public gateway. Enable for audits that need every gateway's answer."
+    )
+    
+    cached_precheck = st.sidebar.checkbox(
+        "💤 Cached-only pre-check",
+        value=False,
+        help="First ask gateways only for content they already hold (fast answers, no slow retrievals), "
+             "then re-probe every 'not cached' answer with a full fetch."
+    )
+    
     # IMPORTANT: Always include old.web3.storage gateways for shutdown analysis
     include_old_web3 = st.sidebar.checkbox(
         "🚨 Include old.web3.storage gateways", 
@@ -694,8 +1103,8 @@ def main():
             if st.button("🔍 Analyze Wallet Assets") and wallet_address:
                 with st.spinner("🔎 Fetching wallet assets..."):
                     try:
-                        # Fetch all assets from wallet
-                        assets, error = utils.get_all_creator_assets(wallet_address)
+                        # Fetch all assets from wallet (cached for WALLET_ASSETS_CACHE_TTL seconds)
+                        assets, error = get_wallet_assets(wallet_address)
                         
                         if error:
                             st.error(f"❌ Error fetching assets: {error}")
@@ -721,32 +1130,26 @@ def main():
                             sampled_assets = sample_assets_strategically(assets, sample_size)
                             st.info(f"🎯 Selected {len(sampled_assets)} assets from different parts of the collection")
                             
-                            # Show selected assets
+                            # Show selected assets (one markdown element, not one per asset)
                             with st.expander("🔍 Selected Assets"):
+                                asset_lines = []
                                 for i, asset in enumerate(sampled_assets):
-                                    asset_name = asset.get('params', {}).get('name', 'Unknown')
+                                    asset_params = asset.get('params', {})
+                                    asset_name = asset_params.get('name', 'Unknown')
                                     asset_id = asset.get('index', 'Unknown')
-                                    asset_url = asset.get('params', {}).get('url', '')[:50]
-                                    st.write(f"{i+1}. **{asset_name}** (ID: {asset_id}) - URL: {asset_url}...")
+                                    asset_url = asset_params.get('url', '')[:50]
+                                    asset_lines.append(f"{i+1}. **{asset_name}** (ID: {asset_id}) - URL: {asset_url}...")
+                                st.markdown("\n".join(asset_lines))
                             
                             # Extract CIDs from selected assets with detailed output
-                            with st.expander("🔧 CID Extraction Process", expanded=True):
-                                # Capture the extraction output
-                                import io
-                                import sys
-                                
-                                # Redirect stdout to capture print statements
-                                old_stdout = sys.stdout
-                                sys.stdout = buffer = io.StringIO()
-                                
-                                try:
-                                    cids_to_test = extract_cids_from_assets(sampled_assets)
-                                finally:
-                                    sys.stdout = old_stdout
-                                
-                                # Display the captured output
-                                output = buffer.getvalue()
-                                if output:
+                            # Capture the extraction log (no process-wide stdout swap)
+                            with capture_extraction_log() as buffer:
+                                cids_to_test = extract_cids_from_assets(sampled_assets)
+                            
+                            # Cache hits log nothing - only show the expander when there is output
+                            output = buffer.getvalue()
+                            if output:
+                                with st.expander("🔧 CID Extraction Process", expanded=False):
                                     st.text(output)
                             
                             if cids_to_test:
@@ -754,8 +1157,7 @@ def main():
                                 
                                 # Show the CIDs that will be tested
                                 with st.expander("📋 CIDs to Test"):
-                                    for i, cid in enumerate(cids_to_test):
-                                        st.code(f"{i+1}. {cid}")
+                                    st.code("\n".join(f"{i+1}. {cid}" for i, cid in enumerate(cids_to_test)))
                             else:
                                 st.error("❌ No valid CIDs found in selected assets!")
                                 st.info("""
@@ -779,8 +1181,24 @@ def main():
             
             if uploaded_file and st.button("🔍 Test CIDs from File"):
                 try:
-                    content = uploaded_file.read().decode('utf-8')
-                    cids_to_test = [cid.strip() for cid in content.split('\n') if cid.strip()]
+                    # Decode line by line instead of read().decode().split() (one copy of the file, not three),
+                    # dropping blank, unrecognized and repeated lines in the same pass
+                    uploaded_file.seek(0)  # The upload buffer is reused across reruns
+                    lines = io.TextIOWrapper(uploaded_file, encoding='utf-8', newline='')
+                    unrecognized_lines = 0
+                    try:
+                        file_cids = {}
+                        for cid in map(str.strip, lines):
+                            if _CID_RE.match(cid):
+                                file_cids[cid] = None
+                            elif cid:
+                                unrecognized_lines += 1
+                        cids_to_test = list(file_cids)
+                    finally:
+                        lines.detach()  # Leave the upload open for later reruns
+                    if unrecognized_lines:
+                        st.warning(f"⚠️ Skipped {unrecognized_lines} line(s) that don't look like a CIDv0 (Qm...) "
+                                   f"or base32 CIDv1 (b...)")
                 except Exception as e:
                     st.error(f"❌ Error reading file: {str(e)}")
     
@@ -794,10 +1212,10 @@ def main():
         
         # Always include old.web3.storage gateways if enabled
         if include_old_web3:
-            selected_gateways.extend(list(tester.old_web3_storage_gateways.keys()))
+            selected_gateways.extend(tester.old_web3_storage_gateways)
         
         # Add pinning service gateways
-        selected_gateways.extend(list(tester.pinning_service_gateways.keys()))
+        selected_gateways.extend(tester.pinning_service_gateways)
         
         # Add reliable gateways
         selected_gateways.extend(tester.reliable_gateways[:3])
@@ -805,7 +1223,8 @@ def main():
         # Fill remaining slots with other gateways
         remaining_slots = max(0, num_gateways - len(selected_gateways))
         if remaining_slots > 0:
-            available_others = [gw for gw in tester.other_public_gateways if gw not in selected_gateways]
+            already_selected = set(selected_gateways)
+            available_others = [gw for gw in tester.other_public_gateways if gw not in already_selected]
             selected_gateways.extend(random.sample(available_others, min(remaining_slots, len(available_others))))
         
         # Limit to requested number
@@ -814,20 +1233,19 @@ def main():
         st.info(f"🌐 Testing with {len(selected_gateways)} gateways (including old.web3.storage for shutdown analysis)")
         
         with st.expander("🔍 View Selected Gateways"):
+            gateway_lines = []
             for gw in selected_gateways:
-                gateway_name = gw.replace('https://', '').replace('/ipfs/', '')
+                gateway_name = _gateway_label(gw)
                 
-                if gw in tester.old_web3_storage_gateways:
-                    badge = "🚨 OLD.WEB3.STORAGE (SHUTTING DOWN)"
-                elif gw in tester.pinning_service_gateways:
-                    service_name = tester.pinning_service_gateways[gw]
-                    badge = f"🔒 {service_name.upper()} SERVICE"
-                elif gw in tester.reliable_gateways:
-                    badge = "🟢 RELIABLE PUBLIC"
+                # One type lookup instead of walking the gateway dicts in turn
+                gateway_type = tester.gateway_types.get(gw)
+                if gateway_type == "pinning_service":
+                    badge = f"🔒 {tester.pinning_service_gateways[gw].upper()} SERVICE"
                 else:
-                    badge = "🌐 PUBLIC ACCESS"
-                    
-                st.write(f"• {gateway_name} {badge}")
+                    badge = GATEWAY_TYPE_BADGES.get(gateway_type, "🌐 PUBLIC ACCESS")
+                
+                gateway_lines.append(f"• {gateway_name} {badge}")
+            st.markdown("\n\n".join(gateway_lines))
         
         # Run the test
         progress_bar = st.progress(0)
@@ -838,20 +1256,19 @@ def main():
                 cids_to_test, 
                 selected_gateways, 
                 progress_bar,
-                status_text
+                status_text,
+                max_workers=max_concurrent_tests,
+                early_exit=not thorough_mode,
+                cached_precheck=cached_precheck
             )
         
         # NEW: Add 4everland API check if API key provided
         if everland_api_key:
             status_text.text("🔍 Checking 4everland via API...")
-            everland_results = {}
-            
-            for cid in cids_to_test:
-                is_pinned, status = tester.check_4everland_via_api(cid, everland_api_key)
-                everland_results[cid] = {
-                    'pinned': is_pinned,
-                    'status': status
-                }
+            everland_results = {
+                cid: {'pinned': is_pinned, 'status': status}
+                for cid, (is_pinned, status) in tester.check_4everland_batch(cids_to_test, everland_api_key).items()
+            }
             
             # Add 4everland results to the main results
             if 'api_services' not in results['risk_analysis']:
@@ -859,25 +1276,87 @@ def main():
             
             results['risk_analysis']['api_services']['4everland'] = {
                 'results': everland_results,
-                'total_pinned': sum(1 for r in everland_results.values() if r['pinned']),
+                'total_pinned': sum(map(itemgetter('pinned'), everland_results.values())),
                 'total_tested': len(everland_results)
             }
         
         status_text.text("✅ Testing complete!")
         progress_bar.progress(1.0)
         
+        probe_hits = st.session_state.get('probe_hits', 0)
+        probe_total = probe_hits + st.session_state.get('probe_misses', 0)
+        if probe_total:
+            st.caption(f"💾 Probe cache: {probe_hits}/{probe_total} gateway probes served from cache this session "
+                       f"({probe_hits / probe_total * 100:.0f}%)")
+        
         # ENHANCED: Shutdown Risk Analysis
         if include_old_web3:
             shutdown_analysis = tester.analyze_shutdown_risk(results['individual_results'])
+        
+        # One pass over the results builds the shutdown and detailed table rows
+        # (tuples in *_TABLE_COLUMNS order - no per-row dict keys for pandas to hash and align)
+        everland_map = results['risk_analysis'].get('api_services', {}).get('4everland', {}).get('results', {})
+        gateway_total = len(selected_gateways)
+        shutdown_rows = []
+        detail_rows = []
+        for result in results['individual_results']:
+            cid = result['cid']
+            summary = result['summary']
+            cid_display = f"{cid[:20]}..." if len(cid) > 20 else cid
             
+            if include_old_web3:
+                shutdown_info = result['shutdown_analysis']
+                old_web3_services = shutdown_info['old_web3_services']
+                other_sources = shutdown_info['other_sources']
+                
+                # Add 4everland info if available
+                everland_status = ""
+                if everland_map.get(cid, {}).get('pinned'):
+                    everland_status = " + 4everland"
+                    other_sources += 1  # Count 4everland as another source
+                
+                # Determine shutdown risk
+                if other_sources == 0 and old_web3_services:
+                    shutdown_risk = "🚨 CRITICAL - Will be lost"
+                    action_needed = "URGENT: Re-pin immediately"
+                elif old_web3_services:
+                    shutdown_risk = "⚠️ AT RISK - Currently depends on old.web3.storage"  
+                    action_needed = "RECOMMENDED: Verify other sources"
+                elif other_sources > 0:
+                    shutdown_risk = "✅ SAFE - Not dependent"
+                    action_needed = "None"
+                else:
+                    shutdown_risk = "⚫ UNREACHABLE"
+                    action_needed = "Already lost"
+                
+                shutdown_rows.append((
+                    cid_display,
+                    shutdown_risk,
+                    ', '.join(old_web3_services) or "Not found",
+                    f"{other_sources} sources{everland_status}",
+                    action_needed
+                ))
+            
+            # Raw per-CID figures - risk levels are tagged for all CIDs at once below
+            detail_rows.append((
+                cid_display,
+                ', '.join(result['pinning_services_available']) or "None",
+                summary['network_available'],
+                summary['pinning_service_count'],
+                summary['old_web3_storage_count'],
+                summary['available_count']
+            ))
+        
+        if include_old_web3:
             st.markdown("---")
             st.markdown("## 🚨 OLD.WEB3.STORAGE SHUTDOWN ANALYSIS")
             
-            # Shutdown risk metrics
+            # Shutdown risk metrics (counts read once, reused by the warnings below)
+            critical_count, at_risk_count, safe_count, unreachable_count = map(len, itemgetter(
+                'critical_risk', 'at_risk', 'safe', 'unreachable')(shutdown_analysis))
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                critical_count = len(shutdown_analysis['critical_risk'])
                 st.metric(
                     "🚨 CRITICAL", 
                     critical_count,
@@ -885,7 +1364,6 @@ def main():
                 )
             
             with col2:
-                at_risk_count = len(shutdown_analysis['at_risk'])
                 st.metric(
                     "⚠️ AT RISK", 
                     at_risk_count,
@@ -893,7 +1371,6 @@ def main():
                 )
             
             with col3:
-                safe_count = len(shutdown_analysis['safe'])
                 st.metric(
                     "✅ SAFE", 
                     safe_count,
@@ -901,7 +1378,6 @@ def main():
                 )
             
             with col4:
-                unreachable_count = len(shutdown_analysis['unreachable'])
                 st.metric(
                     "⚫ UNREACHABLE", 
                     unreachable_count,
@@ -911,46 +1387,7 @@ def main():
             # Detailed shutdown risk table
             st.markdown("### 🚨 Shutdown Risk Details")
             
-            shutdown_data = []
-            
-            # Process all results for shutdown analysis
-            for result in results['individual_results']:
-                cid = result['cid']
-                shutdown_info = result.get('shutdown_analysis', {})
-                old_web3_services = shutdown_info.get('old_web3_services', [])
-                other_sources = shutdown_info.get('other_sources', 0)
-                
-                # Add 4everland info if available
-                everland_status = ""
-                if everland_api_key and 'api_services' in results['risk_analysis']:
-                    everland_data = results['risk_analysis']['api_services']['4everland']['results'].get(cid, {})
-                    if everland_data.get('pinned'):
-                        everland_status = " + 4everland"
-                        other_sources += 1  # Count 4everland as another source
-                
-                # Determine shutdown risk
-                if other_sources == 0 and len(old_web3_services) > 0:
-                    shutdown_risk = "🚨 CRITICAL - Will be lost"
-                    action_needed = "URGENT: Re-pin immediately"
-                elif len(old_web3_services) > 0:
-                    shutdown_risk = "⚠️ AT RISK - Currently depends on old.web3.storage"  
-                    action_needed = "RECOMMENDED: Verify other sources"
-                elif other_sources > 0:
-                    shutdown_risk = "✅ SAFE - Not dependent"
-                    action_needed = "None"
-                else:
-                    shutdown_risk = "⚫ UNREACHABLE"
-                    action_needed = "Already lost"
-                
-                shutdown_data.append({
-                    'CID': f"{cid[:20]}..." if len(cid) > 20 else cid,
-                    'Shutdown Risk': shutdown_risk,
-                    'Old.Web3.Storage': ', '.join(old_web3_services) or "Not found",
-                    'Other Sources': f"{other_sources} sources{everland_status}",
-                    'Action Needed': action_needed
-                })
-            
-            df_shutdown = pd.DataFrame(shutdown_data)
+            df_shutdown = pd.DataFrame.from_records(shutdown_rows, columns=SHUTDOWN_TABLE_COLUMNS)
             st.dataframe(df_shutdown, use_container_width=True)
             
             # Urgent warnings
@@ -1029,42 +1466,32 @@ def main():
         
         # Enhanced detailed results
         st.markdown("### 📋 Detailed Results")
-        detailed_data = []
-        for result in results['individual_results']:
-            cid = result['cid']
-            pinning_services = ', '.join(result['pinning_services_available']) or "None"
-            
-            # CORRECTED risk level calculation
-            pinning_count = result['summary']['pinning_service_count']
-            old_web3_count = result['summary']['old_web3_storage_count']
-            network_available = result['summary']['network_available']
-            
-            if not network_available:
-                risk_level = "⚫ Unreachable"
-                risk_detail = "Not found anywhere"
-            elif pinning_count == 0 and old_web3_count > 0:
-                risk_level = "🔴 Critical Risk"
-                risk_detail = "Only on shutting-down services"
-            elif pinning_count == 0:
-                risk_level = "🔴 High Risk"  
-                risk_detail = "No confirmed pinning services"
-            elif pinning_count == 1:
-                risk_level = "🟡 Medium Risk"
-                risk_detail = "Single pinning service"
-            else:
-                risk_level = "🟢 Low Risk"
-                risk_detail = f"{pinning_count} pinning services"
-            
-            detailed_data.append({
-                'CID': f"{cid[:20]}..." if len(cid) > 20 else cid,
-                'Risk Level': risk_level,
-                'Risk Detail': risk_detail,
-                'Pinning Services': pinning_services,
-                'Network Available': "✅" if network_available else "❌",
-                'Total Gateways': f"{result['summary']['available_count']}/{len(selected_gateways)}"
-            })
-        
-        df = pd.DataFrame(detailed_data)
+        df = pd.DataFrame.from_records(detail_rows, columns=DETAIL_RAW_COLUMNS).astype(
+            {'network_available': bool, 'pinning_count': int, 'old_web3_count': int, 'available_count': int})
+        
+        # CORRECTED risk level calculation, vectorized: unreachable, only on shutting-down services,
+        # no pinning service, single pinning service, else low risk
+        pinning_counts = df['pinning_count']
+        risk_conditions = [
+            ~df['network_available'],
+            (pinning_counts == 0) & (df['old_web3_count'] > 0),
+            pinning_counts == 0,
+            pinning_counts == 1
+        ]
+        df['Risk Level'] = np.select(
+            risk_conditions,
+            ["⚫ Unreachable", "🔴 Critical Risk", "🔴 High Risk", "🟡 Medium Risk"],
+            default="🟢 Low Risk"
+        )
+        df['Risk Detail'] = np.select(
+            risk_conditions,
+            ["Not found anywhere", "Only on shutting-down services", "No confirmed pinning services",
+             "Single pinning service"],
+            default=pinning_counts.astype(str) + " pinning services"
+        )
+        df['Network Available'] = np.where(df['network_available'], "✅", "❌")
+        df['Total Gateways'] = df['available_count'].astype(str) + f"/{gateway_total}"
+        df = df[list(DETAIL_TABLE_COLUMNS)]
         st.dataframe(df, use_container_width=True)
         
         # Corrected recommendations
@@ -1115,25 +1542,30 @@ def main():
         
         col1, col2 = st.columns(2)
         
+        # Serialized once per test run and handed straight to the download buttons - a separate
+        # "prepare" button would rerun the script, and the results only exist on the run that made them
+        report = {key: value for key, value in results.items() if key != 'probes'}
+        if ORJSON_AVAILABLE:
+            json_data = orjson.dumps(report)
+        else:
+            json_data = json.dumps(report, separators=(',', ':')).encode()
+        report_time = int(time.time())
+        
         with col1:
-            if st.button("📥 Download JSON Report"):
-                json_data = json.dumps(results, indent=2)
-                st.download_button(
-                    label="📄 Download JSON",
-                    data=json_data,
-                    file_name=f"gateway_risk_report_{int(time.time())}.json",
-                    mime="application/json"
-                )
+            st.download_button(
+                label="📥 Download JSON Report",
+                data=json_data,
+                file_name=f"gateway_risk_report_{report_time}.json",
+                mime="application/json"
+            )
         
         with col2:
-            if st.button("📊 Download CSV Summary"):
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    label="📄 Download CSV",
-                    data=csv_data,
-                    file_name=f"gateway_risk_summary_{int(time.time())}.csv",
-                    mime="text/csv"
-                )
+            st.download_button(
+                label="📊 Download CSV Summary",
+                data=df.to_csv(index=False).encode(),
+                file_name=f"gateway_risk_summary_{report_time}.csv",
+                mime="text/csv"
+            )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -7,33 +7,42 @@ Gateway Tester UI Launcher with Auto-Install
 import subprocess
 import sys
 import os
-import importlib.util
+import re
 
-def install_package(package_name, pip_name=None):
-    """Install a package using pip."""
-    if pip_name is None:
-        pip_name = package_name
-    
-    print(f"📦 Installing {package_name}...")
+def install_packages(packages):
+    """Install (package_name, pip_name) pairs with a single pip run (one startup, one resolve)."""
+    package_names = ', '.join(package_name for package_name, _ in packages)
+    print(f"📦 Installing {package_names}...")
     try:
         subprocess.check_call([
-            sys.executable, "-m", "pip", "install", pip_name, 
+            sys.executable, "-m", "pip", "install", *(pip_name for _, pip_name in packages),
             "--quiet", "--disable-pip-version-check"
         ])
-        print(f"✅ {package_name} installed successfully")
+        print(f"✅ {package_names} installed successfully")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to install {package_name}: {e}")
+        print(f"❌ Failed to install {package_names}: {e}")
         return False
 
+def installed_distributions():
+    """Normalized names of every installed distribution (one metadata scan, nothing imported)."""
+    # Imported here so an unsupported Python reaches the version check in main() first
+    import importlib.metadata
+    return {
+        re.sub(r'[-_.]+', '-', dist.metadata['Name']).lower()
+        for dist in importlib.metadata.distributions()
+        if dist.metadata['Name']
+    }
+
 def check_and_install_requirements():
     """Check if required packages are installed and install if missing."""
     # Essential packages (required)
     essential_packages = [
         ('streamlit', 'streamlit'),
         ('pandas', 'pandas'),
+        ('numpy', 'numpy'),
         ('requests', 'requests'),
-        ('algosdk', 'algorand-python-sdk'),
+        ('algosdk', 'py-algorand-sdk'),
         ('base58', 'base58'),
         ('multibase', 'py-multibase')
     ]
@@ -44,28 +53,31 @@ def check_and_install_requirements():
     ]
     
     print("🔍 Checking essential packages...")
+    installed = installed_distributions()
     
-    # Install essential packages
+    # Install missing essential packages together
+    missing = []
     for package_name, pip_name in essential_packages:
-        try:
-            importlib.util.find_spec(package_name)
+        if pip_name.lower() in installed:
             print(f"✅ {package_name} - already installed")
-        except ImportError:
-            if not install_package(package_name, pip_name):
-                return False
+        else:
+            missing.append((package_name, pip_name))
+    if missing and not install_packages(missing):
+        return False
     
     # Try to install optional packages
     print("\n🎨 Checking optional packages (for enhanced charts)...")
+    missing = []
     for package_name, pip_name in optional_packages:
-        try:
-            importlib.util.find_spec(package_name)
+        if pip_name.lower() in installed:
             print(f"✅ {package_name} - already installed")
-        except ImportError:
-            print(f"📦 Installing optional package: {package_name}...")
-            if install_package(package_name, pip_name):
-                print(f"✅ {package_name} installed - you'll get fancy charts!")
-            else:
-                print(f"⚠️ {package_name} failed to install - using simple charts instead")
+        else:
+            missing.append((package_name, pip_name))
+    if missing:
+        if install_packages(missing):
+            print("✅ Optional packages installed - you'll get fancy charts!")
+        else:
+            print("⚠️ Optional packages failed to install - using simple charts instead")
     
     print("\n✅ All essential packages are ready!")
     return True
@@ -86,8 +98,8 @@ def main():
     print("=" * 50)
     
     # Check Python version
-    if sys.version_info < (3, 7):
-        print("❌ Python 3.7 or higher is required!")
+    if sys.version_info < (3, 9):
+        print("❌ Python 3.9 or higher is required!")
         print(f"💡 Current version: {sys.version}")
         sys.exit(1)
     
@@ -7,16 +7,55 @@ with comprehensive error handling and recovery mechanisms.
 """
 
 import json
+import logging
+import os
 import time
 from datetime import datetime
 from utils import (
     get_all_creator_assets, 
     process_arc19_collection_robust, 
     recover_failed_assets,
-    create_collection_dataframe
+    create_collection_dataframe,
+    write_json_file
 )
 
-def safe_test_robust_processing(creator_address, test_mode="small_sample"):
+logger = logging.getLogger(__name__)
+
+# Fetched creator assets are cached per address next to the pin lookup cache, not in the working directory
+ASSETS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cyber_repinning")
+ASSETS_CACHE_TTL = 600  # seconds
+
+def _fetch_or_load_assets(creator_address, ttl=ASSETS_CACHE_TTL):
+    """
+    Fetch a creator's assets, reusing a copy cached on disk within the last ttl seconds
+    so repeated test runs don't re-paginate the whole indexer.
+    Returns: (assets, error) like get_all_creator_assets
+    """
+    cache_path = os.path.join(ASSETS_CACHE_DIR, f"assets_{creator_address}.json")
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached['creator_address'] == creator_address and time.time() - cached['fetched_at'] < ttl:
+            print(f"💾 Using {len(cached['assets'])} cached assets from {cache_path}")
+            return cached['assets'], None
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    print(f"🔍 Fetching assets for creator: {creator_address}")
+    all_assets, error = get_all_creator_assets(creator_address)
+    if not error:
+        try:
+            os.makedirs(ASSETS_CACHE_DIR, exist_ok=True)
+            write_json_file(cache_path, {
+                'creator_address': creator_address,
+                'fetched_at': time.time(),
+                'assets': all_assets
+            })
+        except (OSError, TypeError) as e:
+            print(f"⚠️ Could not cache assets: {e}")
+    return all_assets, error
+
+def safe_test_robust_processing(creator_address, test_mode="small_sample", assets=None):
     """
     Safely test the robust processing with different test modes.
     
@@ -24,17 +63,21 @@ def safe_test_robust_processing(creator_address, test_mode="small_sample"):
         creator_address: The Algorand creator address
         test_mode: "small_sample" (10 assets), "medium_sample" (100 assets), 
                    "large_sample" (500 assets), or "full_collection"
+        assets: Pre-fetched creator assets (fetched here when None)
     """
     print(f"🧪 SAFE TESTING MODE: {test_mode}")
     print(f"📅 Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Fetch all assets first
-    print(f"🔍 Fetching assets for creator: {creator_address}")
-    all_assets, error = get_all_creator_assets(creator_address)
-    
-    if error:
-        print(f"❌ Error fetching assets: {error}")
-        return None
+    # Fetch all assets first (unless the caller already has them)
+    if assets is None:
+        print(f"🔍 Fetching assets for creator: {creator_address}")
+        all_assets, error = get_all_creator_assets(creator_address)
+        
+        if error:
+            print(f"❌ Error fetching assets: {error}")
+            return None
+    else:
+        all_assets = assets
     
     print(f"📊 Total assets found: {len(all_assets)}")
     
@@ -58,16 +101,17 @@ def safe_test_robust_processing(creator_address, test_mode="small_sample"):
     # Create progress callback
     def progress_callback(current, total, results):
         if current % 25 == 0 or current == total:
-            print(f"📈 PROGRESS: {current}/{total} ({(current/total)*100:.1f}%) - "
-                  f"Success: {results['success_count']}, Failed: {results['failure_count']}")
+            logger.info("📈 PROGRESS: %d/%d (%.1f%%) - Success: %d, Failed: %d",
+                        current, total, (current/total)*100,
+                        results['success_count'], results['failure_count'])
     
     # Run robust processing
-    start_time = time.time()
+    start_time = time.monotonic()
     
     print(f"\n🚀 Starting robust processing of {len(test_assets)} assets...")
     results = process_arc19_collection_robust(test_assets, progress_callback)
     
-    processing_time = time.time() - start_time
+    processing_time = time.monotonic() - start_time
     
     # Print detailed results
     print(f"\n📊 PROCESSING RESULTS:")
@@ -87,9 +131,9 @@ def safe_test_robust_processing(creator_address, test_mode="small_sample"):
     # Attempt recovery if there are failures
     if results['failed_assets']:
         print(f"\n🔄 ATTEMPTING RECOVERY for {len(results['failed_assets'])} failed assets...")
-        recovery_start = time.time()
+        recovery_start = time.monotonic()
         recovery_results = recover_failed_assets(results['failed_assets'], max_retries=2)
-        recovery_time = time.time() - recovery_start
+        recovery_time = time.monotonic() - recovery_start
         
         print(f"   ⏱️  Recovery time: {recovery_time:.2f} seconds")
         print(f"   ✅ Recovered: {recovery_results['recovery_count']}")
@@ -132,11 +176,18 @@ def safe_test_robust_processing(creator_address, test_mode="small_sample"):
         serializable_results['final_success_rate'] = final_success_rate
         serializable_results['recovery_time'] = recovery_time
     
-    with open(results_file, 'w') as f:
-        json.dump(serializable_results, f, indent=2)
+    write_json_file(results_file, serializable_results)
     
     print(f"\n💾 Detailed results saved to: {results_file}")
     
+    # The summary keeps only 10 failures - stream the full list to a JSON Lines sidecar
+    if len(results['failed_assets']) > 10:
+        failures_file = f"test_results_{test_mode}_{timestamp}_failed.jsonl"
+        with open(failures_file, 'w') as f:
+            for failed_asset in results['failed_assets']:
+                f.write(json.dumps(failed_asset) + '\n')
+        print(f"💾 All {len(results['failed_assets'])} failures saved to: {failures_file}")
+    
     # Return results for further analysis
     return {
         'results': results,
@@ -144,26 +195,30 @@ def safe_test_robust_processing(creator_address, test_mode="small_sample"):
         'test_file': results_file
     }
 
-def compare_with_legacy_processing(creator_address, sample_size=50):
+def compare_with_legacy_processing(creator_address, sample_size=50, assets=None):
     """
     Compare the new robust processing with the legacy method on a small sample.
+    Pass assets to reuse an already fetched asset list.
     """
     print(f"⚖️  COMPARISON TEST: Robust vs Legacy Processing")
     
     # Fetch assets
-    all_assets, error = get_all_creator_assets(creator_address)
-    if error:
-        print(f"❌ Error fetching assets: {error}")
-        return
+    if assets is None:
+        all_assets, error = get_all_creator_assets(creator_address)
+        if error:
+            print(f"❌ Error fetching assets: {error}")
+            return
+    else:
+        all_assets = assets
     
     test_assets = all_assets[:sample_size]
     print(f"🔬 Testing {sample_size} assets with both methods")
     
     # Test legacy method (existing create_collection_dataframe)
     print(f"\n1️⃣ Testing LEGACY method...")
-    legacy_start = time.time()
+    legacy_start = time.monotonic()
     legacy_df = create_collection_dataframe(test_assets)
-    legacy_time = time.time() - legacy_start
+    legacy_time = time.monotonic() - legacy_start
     
     legacy_success = len(legacy_df[legacy_df['image_cid'] != ''])
     legacy_failed = len(legacy_df[legacy_df['image_cid'] == ''])
@@ -174,9 +229,9 @@ def compare_with_legacy_processing(creator_address, sample_size=50):
     
     # Test robust method
     print(f"\n2️⃣ Testing ROBUST method...")
-    robust_start = time.time()
+    robust_start = time.monotonic()
     robust_results = process_arc19_collection_robust(test_assets)
-    robust_time = time.time() - robust_start
+    robust_time = time.monotonic() - robust_start
     
     print(f"   ⏱️  Robust time: {robust_time:.2f} seconds")
     print(f"   ✅ Robust success: {robust_results['success_count']}/{sample_size}")
@@ -193,26 +248,34 @@ if __name__ == "__main__":
     # Example usage - replace with your creator address
     CREATOR_ADDRESS = "CV3ZM4KVJS4CRMXEVMABNIHP3LCQAJJEYMYXF3NNBYJUW7C4CTVD7PUEOY"
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("🧪 SAFE TESTING SUITE")
     print("=" * 50)
     
+    # Fetch the collection once and share it across every test tier
+    all_assets, error = _fetch_or_load_assets(CREATOR_ADDRESS)
+    if error:
+        print(f"❌ Error fetching assets: {error}")
+        raise SystemExit(1)
+    
     # Run progressive tests
     print("\n1️⃣ Small sample test (10 assets)")
-    small_results = safe_test_robust_processing(CREATOR_ADDRESS, "small_sample")
+    small_results = safe_test_robust_processing(CREATOR_ADDRESS, "small_sample", assets=all_assets)
     
     if small_results and small_results['results']['processing_summary']['success_rate'] > 70:
         print("\n2️⃣ Medium sample test (100 assets)")
-        medium_results = safe_test_robust_processing(CREATOR_ADDRESS, "medium_sample")
+        medium_results = safe_test_robust_processing(CREATOR_ADDRESS, "medium_sample", assets=all_assets)
         
         if medium_results and medium_results['results']['processing_summary']['success_rate'] > 70:
             print("\n3️⃣ Comparison test")
-            compare_with_legacy_processing(CREATOR_ADDRESS, 50)
+            compare_with_legacy_processing(CREATOR_ADDRESS, 50, assets=all_assets)
             
             # Only proceed to full test if everything looks good
             user_input = input("\n❓ Results look good. Proceed with full collection? (y/N): ")
             if user_input.lower() == 'y':
                 print("\n4️⃣ Full collection test")
-                full_results = safe_test_robust_processing(CREATOR_ADDRESS, "full_collection")
+                full_results = safe_test_robust_processing(CREATOR_ADDRESS, "full_collection", assets=all_assets)
             else:
                 print("✅ Safe testing complete. Review results before full deployment.")
         else:
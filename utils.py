@@ -4,9 +4,27 @@ import pandas as pd
 import requests
 import base58
 import algosdk.encoding
-import multibase
 import json
+import random
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Optional fast serializers for large exports - pandas/stdlib are used when they are missing
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def redact_sensitive_headers(headers):
     """
@@ -166,6 +184,18 @@ def extract_cid_from_asset(asset):
         print(f"DEBUG: General error extracting CID: {e}")
         return None
 
+# ARC-19 template URL, e.g. template-ipfs://{ipfscid:1:raw:reserve:sha2-256}
+ARC19_TEMPLATE_PATTERN = re.compile(r"template-ipfs://\{ipfscid:(?P<version>\d+):(?P<codec>[\w-]+):(?P<field>\w+):(?P<hash_type>[\w-]+)\}")
+
+# Multicodec codes for CIDv1 content types, and the sha2-256 multihash prefix
+CID_CODECS = {'raw': 0x55, 'dag-pb': 0x70, 'dag-cbor': 0x71}
+SHA2_256_MULTIHASH_PREFIX = bytes([0x12, 0x20])
+
+def _encode_cidv1(cid_codec, digest):
+    """Encode a sha2-256 digest as a base32 CIDv1 string (multibase prefix 'b')."""
+    cid_bytes = bytes([0x01, CID_CODECS.get(cid_codec, 0x55)]) + SHA2_256_MULTIHASH_PREFIX + digest
+    return 'b' + base64.b32encode(cid_bytes).decode('ascii').rstrip('=').lower()
+
 def extract_arc19_cid(asset_params):
     """Extract CID from ARC-19 template URL."""
     try:
@@ -179,9 +209,7 @@ def extract_arc19_cid(asset_params):
         print(f"DEBUG ARC19: metadata_mime_type = '{metadata_mime_type}' (empty: {not metadata_mime_type})")
         
         # First, try to parse as ARC19 template format (regardless of metadata_mime_type)
-        # Parse ARC19 template format
-        pattern = re.compile(r"template-ipfs://\{ipfscid:(?P<version>\d+):(?P<codec>[\w-]+):(?P<field>\w+):(?P<hash_type>[\w-]+)\}")
-        match = pattern.match(url)
+        match = ARC19_TEMPLATE_PATTERN.match(url)
         
         if not match:
             print(f"DEBUG ARC19: ❌ URL does not match ARC19 template pattern")
@@ -255,16 +283,7 @@ def extract_arc19_cid(asset_params):
             
             # Construct CID based on version
             if cid_version == 1:
-                codec_map = {'raw': 0x55, 'dag-pb': 0x70, 'dag-cbor': 0x71}
-                codec_byte = codec_map.get(cid_codec, 0x55)
-                
-                if hash_type == 'sha2-256':
-                    multihash = bytes([0x12, 0x20]) + decoded_address
-                else:
-                    multihash = bytes([0x12, 0x20]) + decoded_address
-                
-                cid_bytes = bytes([0x01, codec_byte]) + multihash
-                cid_str = multibase.encode('base32', cid_bytes).decode('ascii')
+                cid_str = _encode_cidv1(cid_codec, decoded_address)
                 print(f"DEBUG ARC19: ✅ Final CIDv1: {cid_str}")
                 return cid_str
             else:
@@ -288,17 +307,7 @@ def extract_arc19_cid(asset_params):
                 print(f"DEBUG ARC19: ✅ Fallback decode successful: {len(decoded_bytes)} bytes")
                 
                 if cid_version == 1:
-                    codec_map = {'raw': 0x55, 'dag-pb': 0x70, 'dag-cbor': 0x71}
-                    codec_byte = codec_map.get(cid_codec, 0x55)
-                    
-                    # Use appropriate hash for CIDv1
-                    if hash_type == 'sha2-256':
-                        multihash = bytes([0x12, 0x20]) + decoded_bytes
-                    else:
-                        multihash = bytes([0x12, 0x20]) + decoded_bytes
-                    
-                    cid_bytes = bytes([0x01, codec_byte]) + multihash
-                    cid_str = multibase.encode('base32', cid_bytes).decode('ascii')
+                    cid_str = _encode_cidv1(cid_codec, decoded_bytes)
                     print(f"DEBUG ARC19: ✅ Fallback CIDv1: {cid_str}")
                     return cid_str
                 else:
@@ -420,20 +429,61 @@ def extract_potential_cid(asset_params):
         print(f"DEBUG POTENTIAL_CID: Error: {e}")
         return None
 
-# Global cache for metadata to avoid refetching same CIDs
-_metadata_cache = {}
+# Global LRU cache for metadata to avoid refetching same CIDs
+METADATA_CACHE_MAXSIZE = 8192
+_metadata_cache = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+_metadata_inflight = {}  # cid -> lock held by the thread currently fetching it
+
+# Concurrent metadata fetching - one pooled session shared by all worker threads
+METADATA_FETCH_WORKERS = 16
+_gateway_session = requests.Session()
+_gateway_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=METADATA_FETCH_WORKERS))
+
+def _get_cached_metadata(metadata_cid):
+    """Return the cached fetch result for a CID (marking it recently used) or None."""
+    with _metadata_cache_lock:
+        cached_result = _metadata_cache.get(metadata_cid)
+        if cached_result is not None:
+            _metadata_cache.move_to_end(metadata_cid)
+        return cached_result
+
+def _store_metadata(metadata_cid, result):
+    """Cache a fetch result, evicting the least recently used entries beyond METADATA_CACHE_MAXSIZE."""
+    with _metadata_cache_lock:
+        _metadata_cache[metadata_cid] = result
+        _metadata_cache.move_to_end(metadata_cid)
+        while len(_metadata_cache) > METADATA_CACHE_MAXSIZE:
+            _metadata_cache.popitem(last=False)
 
 def fetch_metadata_and_extract_image_cid(metadata_cid, retry_count=0, max_retries=2):
     """
     Robust metadata fetching with multiple fallbacks and retry logic.
+    Concurrent calls for the same CID share a single network fetch.
     Returns: (image_cid, metadata_json, status) where status indicates success/failure reason
     """
     # Check cache first
-    if metadata_cid in _metadata_cache:
-        cached_result = _metadata_cache[metadata_cid]
+    cached_result = _get_cached_metadata(metadata_cid)
+    if cached_result is not None:
         print(f"💾 CACHE HIT: Using cached metadata for {metadata_cid[:16]}...")
         return cached_result
     
+    # Single-flight: the first caller fetches, concurrent callers for the same CID wait for its result
+    with _metadata_cache_lock:
+        inflight_lock = _metadata_inflight.setdefault(metadata_cid, threading.Lock())
+    
+    with inflight_lock:
+        cached_result = _get_cached_metadata(metadata_cid)
+        if cached_result is not None:
+            return cached_result
+        try:
+            return _fetch_metadata_uncached(metadata_cid, retry_count, max_retries)
+        finally:
+            with _metadata_cache_lock:
+                _metadata_inflight.pop(metadata_cid, None)
+
+def _fetch_metadata_uncached(metadata_cid, retry_count, max_retries):
+    """Fetch metadata from the gateways and cache the outcome (see fetch_metadata_and_extract_image_cid)."""
     # Extended gateway list with different timeout strategies
     primary_gateways = [
         "https://gateway.pinata.cloud/ipfs/", # Often faster
@@ -457,7 +507,7 @@ def fetch_metadata_and_extract_image_cid(metadata_cid, retry_count=0, max_retrie
             # Adaptive timeout - longer on retries, shorter initially
             timeout = 8 if retry_count > 0 else 5
             
-            response = requests.get(url, timeout=timeout)
+            response = _gateway_session.get(url, timeout=timeout)
             
             if response.status_code == 200:
                 metadata = response.json()
@@ -471,7 +521,7 @@ def fetch_metadata_and_extract_image_cid(metadata_cid, retry_count=0, max_retrie
                     media_cid = animation_url.replace('ipfs://', '').split('#')[0].split('/')[0]
                     print(f"✅ METADATA: Found animation CID: {media_cid} (from animation_url)")
                     result = (media_cid, metadata, "success")
-                    _metadata_cache[metadata_cid] = result  # Cache the result
+                    _store_metadata(metadata_cid, result)  # Cache the result
                     return result
                 
                 # Fallback to image field
@@ -479,13 +529,13 @@ def fetch_metadata_and_extract_image_cid(metadata_cid, retry_count=0, max_retrie
                     media_cid = image_url.replace('ipfs://', '').split('#')[0].split('/')[0]
                     print(f"✅ METADATA: Found image CID: {media_cid} (from image)")
                     result = (media_cid, metadata, "success")
-                    _metadata_cache[metadata_cid] = result  # Cache the result
+                    _store_metadata(metadata_cid, result)  # Cache the result
                     return result
                 
                 else:
                     print(f"⚠️ METADATA: No IPFS media found - animation_url: {animation_url}, image: {image_url}")
                     result = (None, metadata, "no_ipfs_media")
-                    _metadata_cache[metadata_cid] = result  # Cache even failed results
+                    _store_metadata(metadata_cid, result)  # Cache even failed results
                     return result
                     
         except Exception as e:
@@ -496,14 +546,30 @@ def fetch_metadata_and_extract_image_cid(metadata_cid, retry_count=0, max_retrie
     # If we get here, all gateways failed - try retry with different gateways
     if retry_count < max_retries:
         print(f"🔄 METADATA: Retrying with backup gateways (retry {retry_count + 1}/{max_retries})")
-        return fetch_metadata_and_extract_image_cid(metadata_cid, retry_count + 1, max_retries)
+        return _fetch_metadata_uncached(metadata_cid, retry_count + 1, max_retries)
     
     # Final failure after all retries
     print(f"❌ METADATA: Could not fetch metadata for CID: {metadata_cid} after {max_retries + 1} attempts")
     result = (None, None, "fetch_failed")
-    _metadata_cache[metadata_cid] = result  # Cache failed results to avoid re-trying
+    _store_metadata(metadata_cid, result)  # Cache failed results to avoid re-trying
     return result
 
+def prefetch_metadata(metadata_cids, max_workers=METADATA_FETCH_WORKERS):
+    """
+    Warm the metadata cache by fetching many metadata CIDs concurrently.
+    Already-cached and duplicate CIDs are skipped.
+    Returns: number of CIDs fetched
+    """
+    to_fetch = [cid for cid in dict.fromkeys(metadata_cids) if cid and cid not in _metadata_cache]
+    if not to_fetch:
+        return 0
+    
+    print(f"⚡ PREFETCH: Fetching metadata for {len(to_fetch)} CIDs with {min(max_workers, len(to_fetch))} workers")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(to_fetch))) as executor:
+        list(executor.map(fetch_metadata_and_extract_image_cid, to_fetch))
+    
+    return len(to_fetch)
+
 def create_collection_dataframe(assets, existing_df=None, use_robust_processing=True):
     """
     Create a structured DataFrame from the list of assets.
@@ -534,6 +600,23 @@ def create_collection_dataframe(assets, existing_df=None, use_robust_processing=
     processing_mode = "ROBUST" if use_robust_processing else "LEGACY"
     print(f"🔧 DEBUG: Starting {processing_mode} processing of {total_assets} assets...")
     
+    # Resolve ARC standard and metadata CID up front so ARC-19 metadata can be fetched concurrently
+    resolved_assets = []
+    for asset in assets:
+        try:
+            if asset.get('deleted', False):
+                resolved_assets.append(None)
+            else:
+                arc_standard = detect_arc_standard(asset.get('params', {}))
+                resolved_assets.append((arc_standard, extract_cid_from_asset(asset)))
+        except Exception as e:
+            resolved_assets.append(e)  # Re-raised below so it is counted as a processing error
+    
+    prefetch_metadata([
+        resolved[1] for resolved in resolved_assets
+        if isinstance(resolved, tuple) and resolved[0] == 'arc19' and resolved[1]
+    ])
+    
     for i, asset in enumerate(assets):
         try:
             # Enhanced progress indicator with performance stats
@@ -549,9 +632,11 @@ def create_collection_dataframe(assets, existing_df=None, use_robust_processing=
                 print(f"🔧 DEBUG: ❌ Skipping deleted asset {asset_id} ({asset_name})")
                 continue
                 
+            if isinstance(resolved_assets[i], Exception):
+                raise resolved_assets[i]
+            
             asset_params = asset.get('params', {})
-            arc_standard = detect_arc_standard(asset_params)
-            metadata_cid = extract_cid_from_asset(asset)
+            arc_standard, metadata_cid = resolved_assets[i]
             
             if metadata_cid:  # Only include assets with valid CIDs
                 processed_assets += 1
@@ -663,9 +748,7 @@ def create_collection_dataframe(assets, existing_df=None, use_robust_processing=
                     
                     if asset_url and asset_url.startswith('template-ipfs://'):
                         # Check if URL pattern is correct but field is missing
-                        import re
-                        pattern = re.compile(r"template-ipfs://\{ipfscid:(?P<version>\d+):(?P<codec>\w+):(?P<field>\w+):(?P<hash_type>[\w-]+)\}")
-                        match = pattern.match(asset_url)
+                        match = ARC19_TEMPLATE_PATTERN.match(asset_url)
                         if match:
                             params = match.groupdict()
                             field_needed = params['field']
@@ -752,14 +835,40 @@ def create_collection_dataframe(assets, existing_df=None, use_robust_processing=
     
     return df
 
+# Exports above this many rows go through the multithreaded pyarrow/orjson writers when installed
+FAST_EXPORT_MIN_ROWS = 10_000
+
 def dataframe_to_csv(df):
     """Convert DataFrame to CSV bytes."""
+    if PYARROW_AVAILABLE and len(df) > FAST_EXPORT_MIN_ROWS:
+        try:
+            buffer = pa.BufferOutputStream()
+            pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+            return buffer.getvalue().to_pybytes()
+        except pa.ArrowException as e:
+            # Mixed-type object columns can't always be converted - pandas handles them
+            print(f"⚠️ EXPORT: pyarrow CSV writer failed ({e}), falling back to pandas")
     return df.to_csv(index=False).encode('utf-8')
 
 def dataframe_to_json(df):
     """Convert DataFrame to JSON bytes."""
+    if ORJSON_AVAILABLE and len(df) > FAST_EXPORT_MIN_ROWS:
+        try:
+            return orjson.dumps(df.to_dict(orient='records'),
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError as e:
+            print(f"⚠️ EXPORT: orjson writer failed ({e}), falling back to pandas")
     return df.to_json(orient='records', indent=4).encode('utf-8')
 
+def write_json_file(path, data):
+    """Write data to path as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
 # IPFS Pinning Functions
 
 def validate_api_key(service_name, api_key):
@@ -1325,7 +1434,7 @@ def _stream_verify_cids(api_key, cids_to_check):
         page_size = 2000
         offset = 0
         pages_processed = 0
-        start_time = time.time()
+        start_time = time.monotonic()
         max_time = 300  # 5 minutes max (increased for large accounts)
         
         # Dynamic page limit based on collection size
@@ -1342,7 +1451,7 @@ def _stream_verify_cids(api_key, cids_to_check):
         
         while pages_processed < max_pages and len(found_cids) < len(cids_set):
             # Time safety check
-            if time.time() - start_time > max_time:
+            if time.monotonic() - start_time > max_time:
                 print(f"🔍 VERIFICATION: Time limit reached for deployment safety")
                 break
             
@@ -1488,6 +1597,29 @@ def _stream_verify_cids(api_key, cids_to_check):
         # Ultra-safe fallback - just check a few individually
         return _safe_individual_fallback(api_key, cids_to_check[:50])
 
+def _fetch_recent_pin_statuses(api_key, limit, timeout):
+    """
+    Fetch the most recent pins once and index them by CID, so fallbacks can check
+    many CIDs against a single response instead of refetching it per CID.
+    Returns: (dict {cid: status}, error) - error is None on success
+    """
+    try:
+        url = "https://api.4everland.dev/pins"
+        headers = {'Authorization': f'Bearer {api_key}'}
+        response = requests.get(url, headers=headers, params={'limit': limit}, timeout=timeout)
+        
+        if response.status_code != 200:
+            return None, f"API error: HTTP {response.status_code}"
+        
+        recent_statuses = {}
+        for pin in response.json().get('results', []):
+            # First occurrence wins, matching the streaming verification
+            recent_statuses.setdefault(pin.get('pin', {}).get('cid', ''), pin.get('status', 'unknown'))
+        return recent_statuses, None
+        
+    except Exception as e:
+        return None, f"Error: {str(e)[:30]}..."
+
 def _individual_lookup_limited(api_key, cids_to_check):
     """
     Limited individual lookup for missing CIDs after streaming.
@@ -1511,38 +1643,18 @@ def _individual_lookup_limited(api_key, cids_to_check):
     
     print(f"🔍 VERIFICATION: Individual checks for {min(len(cids_to_check), max_individual)} CIDs...")
     
-    for i, cid in enumerate(cids_to_check[:max_individual]):
-        try:
-            # Check recent pins for this specific CID
-            url = "https://api.4everland.dev/pins"
-            headers = {'Authorization': f'Bearer {api_key}'}
-            response = requests.get(url, headers=headers, params={'limit': 200}, timeout=8)
-            
-            if response.status_code == 200:
-                data = response.json()
-                pins = data.get('results', [])
-                
-                # Look for this specific CID
-                for pin in pins:
-                    if pin.get('pin', {}).get('cid', '') == cid:
-                        status = pin.get('status', 'unknown')
-                        valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
-                        is_pinned = status in valid_statuses
-                        results[cid] = (is_pinned, status)
-                        break
-                
-                # If not found in recent, mark as not found
-                if cid not in results:
-                    results[cid] = (False, "Not in recent pins")
-            else:
-                results[cid] = (False, f"API error: HTTP {response.status_code}")
-                
-        except Exception as e:
-            results[cid] = (False, f"Error: {str(e)[:30]}...")
-        
-        # Rate limiting
-        if i % 10 == 0 and i > 0:
-            time.sleep(0.5)
+    # Check every CID against one fetch of the recent pins
+    recent_statuses, error = _fetch_recent_pin_statuses(api_key, limit=200, timeout=8)
+    valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
+    
+    for cid in cids_to_check[:max_individual]:
+        if recent_statuses is None:
+            results[cid] = (False, error)
+        elif cid in recent_statuses:
+            status = recent_statuses[cid]
+            results[cid] = (status in valid_statuses, status)
+        else:
+            results[cid] = (False, "Not in recent pins")
     
     # Mark remaining CIDs as not checked due to limits
     for cid in cids_to_check[max_individual:]:
@@ -1557,6 +1669,10 @@ def _safe_individual_fallback(api_key, cids_to_check):
     
     print(f"🔍 VERIFICATION: Safe fallback for {len(cids_to_check)} CIDs")
     
+    # Simple recent pin check - one request shared by every CID
+    recent_statuses, error = _fetch_recent_pin_statuses(api_key, limit=100, timeout=5)
+    valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
+    
     for i, cid in enumerate(cids_to_check):
         if i >= 50:  # Hard limit for safety
             details.append({
@@ -1564,55 +1680,28 @@ def _safe_individual_fallback(api_key, cids_to_check):
                 'is_pinned': False,
                 'status': "Not checked (safety limit)"
             })
-            continue
-            
-        try:
-            # Simple recent pin check
-            url = "https://api.4everland.dev/pins"
-            headers = {'Authorization': f'Bearer {api_key}'}
-            response = requests.get(url, headers=headers, params={'limit': 100}, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get('results', [])
-                found = False
-                
-                for pin in results:
-                    if pin.get('pin', {}).get('cid', '') == cid:
-                        status = pin.get('status', 'unknown')
-                        valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
-                        is_pinned = status in valid_statuses
-                        details.append({
-                            'cid': cid,
-                            'is_pinned': is_pinned,
-                            'status': f"Status: {status}"
-                        })
-                        if is_pinned:
-                            verified_count += 1
-                        found = True
-                        break
-                
-                if not found:
-                    details.append({
-                        'cid': cid,
-                        'is_pinned': False,
-                        'status': "Not found in recent pins"
-                    })
-            else:
-                details.append({
-                    'cid': cid,
-                    'is_pinned': False,
-                    'status': f"API error: HTTP {response.status_code}"
-                })
-                
-        except Exception as e:
+        elif recent_statuses is None:
             details.append({
                 'cid': cid,
                 'is_pinned': False,
-                'status': f"Error: {str(e)[:30]}..."
+                'status': error
+            })
+        elif cid in recent_statuses:
+            status = recent_statuses[cid]
+            is_pinned = status in valid_statuses
+            details.append({
+                'cid': cid,
+                'is_pinned': is_pinned,
+                'status': f"Status: {status}"
+            })
+            if is_pinned:
+                verified_count += 1
+        else:
+            details.append({
+                'cid': cid,
+                'is_pinned': False,
+                'status': "Not found in recent pins"
             })
-        
-        time.sleep(0.2)  # Rate limiting
     
     return verified_count, details
 
@@ -1684,11 +1773,11 @@ def _get_4everland_pin_lookup(api_key):
         limit = best_page_size
         offset = 0
         page_count = 0
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Remove artificial page limit - let it fetch everything
         while True:
-            page_start_time = time.time()
+            page_start_time = time.perf_counter()
             
             params = {
                 'limit': limit,
@@ -1698,7 +1787,7 @@ def _get_4everland_pin_lookup(api_key):
             print(f"DEBUG VERIFICATION: Fetching page {page_count + 1} (offset {offset}, expecting up to {limit} pins)...")
             
             response = requests.get(url, headers=headers, params=params, timeout=45)
-            page_time = time.time() - page_start_time
+            page_time = time.perf_counter() - page_start_time
             
             if response.status_code == 200:
                 data = response.json()
@@ -1714,7 +1803,7 @@ def _get_4everland_pin_lookup(api_key):
                     break
                 
                 # Safety check for total time (increased to 10 minutes)
-                total_time = time.time() - start_time
+                total_time = time.monotonic() - start_time
                 if total_time > 600:  # 10 minutes
                     print(f"DEBUG VERIFICATION: Time limit reached ({total_time:.1f}s) - stopping at {len(all_results)} pins")
                     break
@@ -1732,7 +1821,7 @@ def _get_4everland_pin_lookup(api_key):
                 print(f"DEBUG VERIFICATION: Failed to fetch page {page_count + 1}: HTTP {response.status_code}")
                 return None, None
         
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         print(f"DEBUG VERIFICATION: Completed in {total_time:.1f}s - retrieved {len(all_results)} pins across {page_count} pages")
         
         # Analyze for duplicates and create lookup
@@ -2564,7 +2653,7 @@ def _get_4everland_pin_lookup_with_duplicates(api_key):
         limit = 2000
         offset = 0
         page_count = 0
-        start_time = time.time()
+        start_time = time.monotonic()
         
         while True:
             params = {'limit': limit, 'offset': offset}
@@ -2855,22 +2944,28 @@ def verify_cleanup_success(api_key, cleanup_results):
         'verified_details': []
     }
     
+    # Index both result lists by CID for O(1) lookups
+    details_by_cid = {detail['cid']: detail for detail in details}
+    cleanup_by_cid = {detail['cid']: detail for detail in cleanup_results['details']}
+    
     # Build detailed results
     for cid in cids_to_verify:
-        if cid in details:
-            status = details[cid]['status']
+        cleanup_detail = cleanup_by_cid[cid]
+        verify_detail = details_by_cid.get(cid)
+        if verify_detail and verify_detail['is_pinned']:
+            status = verify_detail['status']
             print(f"   ✅ {cid[:20]}... still pinned (status: {status})")
             verification_results['verified_details'].append({
                 'cid': cid,
                 'current_status': status,
-                'kept_instance': next(d['kept_instance']['request_id'] for d in cleanup_results['details'] if d['cid'] == cid)
+                'kept_instance': cleanup_detail['kept_instance']['request_id']
             })
         else:
             print(f"   ❌ {cid[:20]}... MISSING - cleanup may have failed!")
             verification_results['missing_details'].append({
                 'cid': cid,
-                'kept_instance': next(d['kept_instance']['request_id'] for d in cleanup_results['details'] if d['cid'] == cid),
-                'deleted_count': next(len(d['deleted_instances']) for d in cleanup_results['details'] if d['cid'] == cid)
+                'kept_instance': cleanup_detail['kept_instance']['request_id'],
+                'deleted_count': len(cleanup_detail['deleted_instances'])
             })
     
     print(f"\n📋 VERIFICATION RESULTS:")
@@ -2904,37 +2999,22 @@ def _multi_tier_individual_fallback(api_key, cids_to_check):
     print(f"🔍 MULTI-TIER FALLBACK: Checking {max_checks}/{len(cids_to_check)} CIDs with progressive strategies")
     
     # TIER 1: Recent pins search (fastest, but limited coverage)
-    print(f"   📋 TIER 1: Recent pins search (checking recent 500 pins per request)")
+    # One request now covers every CID, but each still counts against max_checks as before -
+    # the budget decides whether the per-CID Tier 2/3 API calls run, and that load is unchanged
+    print(f"   📋 TIER 1: Recent pins search (checking recent 500 pins)")
     tier1_found = 0
-    for i, cid in enumerate(cids_to_check[:max_checks]):
-        if checked_count >= max_checks:
-            break
-            
-        try:
-            url = "https://api.4everland.dev/pins"
-            headers = {'Authorization': f'Bearer {api_key}'}
-            response = requests.get(url, headers=headers, params={'limit': 500}, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                pins = data.get('results', [])
-                
-                for pin in pins:
-                    if pin.get('pin', {}).get('cid', '') == cid:
-                        status = pin.get('status', 'unknown')
-                        valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
-                        is_pinned = status in valid_statuses
-                        results[cid] = (is_pinned, f"Tier1: {status}")
-                        tier1_found += 1
-                        break
-                        
-            checked_count += 1
-            if i % 20 == 0 and i > 0:
-                time.sleep(0.3)  # Rate limiting
-                
-        except Exception as e:
-            results[cid] = (False, f"Tier1 error: {str(e)[:20]}...")
-            checked_count += 1
+    recent_statuses, error = _fetch_recent_pin_statuses(api_key, limit=500, timeout=10)
+    checked_count += len(cids_to_check[:max_checks])
+    
+    if recent_statuses is None:
+        print(f"   ❌ TIER 1: Recent pins search failed: {error}")
+    else:
+        valid_statuses = ['pinned', 'queued', 'pinning', 'processing']
+        for cid in cids_to_check[:max_checks]:
+            if cid in recent_statuses:
+                status = recent_statuses[cid]
+                results[cid] = (status in valid_statuses, f"Tier1: {status}")
+                tier1_found += 1
     
     print(f"   ✅ TIER 1: Found {tier1_found} CIDs in recent pins")
     
@@ -3055,6 +3135,16 @@ def process_arc19_collection_robust(assets, progress_callback=None):
     total_assets = len(assets)
     print(f"🚀 ROBUST PROCESSING: Starting {total_assets} ARC-19 assets with full error recovery")
     
+    # CIDs are buffered per batch and merged into the result sets with one set.update each
+    batch_metadata_cids = []
+    batch_image_cids = []
+    
+    def flush_cid_batches():
+        results['unique_metadata_cids'].update(batch_metadata_cids)
+        results['unique_image_cids'].update(batch_image_cids)
+        batch_metadata_cids.clear()
+        batch_image_cids.clear()
+    
     for i, asset in enumerate(assets):
         try:
             asset_id = asset.get('index', f'unknown_{i}')
@@ -3062,6 +3152,7 @@ def process_arc19_collection_robust(assets, progress_callback=None):
             
             # Progress update
             if progress_callback and i % 10 == 0:
+                flush_cid_batches()
                 progress_callback(i, total_assets, results)
             
             # Extract metadata CID using existing logic
@@ -3077,7 +3168,7 @@ def process_arc19_collection_robust(assets, progress_callback=None):
                 results['failure_count'] += 1
                 continue
             
-            results['unique_metadata_cids'].add(metadata_cid)
+            batch_metadata_cids.append(metadata_cid)
             
             # Try to fetch metadata and extract image CID with robust retry logic
             fetch_result = fetch_metadata_and_extract_image_cid(metadata_cid)
@@ -3094,7 +3185,7 @@ def process_arc19_collection_robust(assets, progress_callback=None):
             if status == "success":
                 results['success_count'] += 1
                 if image_cid:
-                    results['unique_image_cids'].add(image_cid)
+                    batch_image_cids.append(image_cid)
                 
                 # Check if this was from cache
                 if metadata_cid in _metadata_cache:
@@ -3143,6 +3234,8 @@ def process_arc19_collection_robust(assets, progress_callback=None):
             results['failure_count'] += 1
             continue
     
+    flush_cid_batches()
+    
     # Final progress update
     if progress_callback:
         progress_callback(total_assets, total_assets, results)
@@ -3167,13 +3260,62 @@ def process_arc19_collection_robust(assets, progress_callback=None):
     
     return results
 
-def recover_failed_assets(failed_assets, max_retries=3):
+# Failure types worth retrying - gateway timeouts are transient; missing CIDs and
+# processing exceptions are deterministic and would fail again
+RECOVERABLE_ERRORS = frozenset({'fetch_timeout', 'fetch_failed'})
+
+# Recovery backoff: delay = min(cap, base * 2**attempt * (1 + jitter)), bounded by a wall-clock deadline
+RECOVERY_BACKOFF_BASE = 1.0
+RECOVERY_BACKOFF_CAP = 30
+RECOVERY_BACKOFF_JITTER = 0.5
+RECOVERY_DEADLINE_SECONDS = 60
+
+def _recover_single_asset(asset_info, max_retries, deadline):
+    """
+    Retry one failed asset with exponential backoff and jitter until it succeeds,
+    gets a definitive answer, runs out of attempts, or would overrun the deadline.
+    Returns: (image_cid, status)
+    """
+    metadata_cid = asset_info['metadata_cid']
+    status = "fetch_failed"
+    
+    for attempt in range(max_retries):
+        # Clear from cache to force fresh attempt
+        with _metadata_cache_lock:
+            _metadata_cache.pop(metadata_cid, None)
+        
+        # First attempt goes to the primary gateways, later attempts to the backup gateways
+        gateway_tier = 0 if attempt == 0 else 1
+        print(f"🔄 Retrying {asset_info['asset_id']}: {metadata_cid[:16]}... (attempt {attempt + 1}/{max_retries})")
+        image_cid, _, status = fetch_metadata_and_extract_image_cid(
+            metadata_cid, retry_count=gateway_tier, max_retries=gateway_tier
+        )
+        
+        # Only gateway failures are worth retrying - anything else is a definitive answer
+        if status != "fetch_failed":
+            return image_cid, status
+        
+        if attempt + 1 >= max_retries:
+            break
+        
+        delay = min(RECOVERY_BACKOFF_CAP,
+                    RECOVERY_BACKOFF_BASE * 2 ** attempt * (1 + random.uniform(0, RECOVERY_BACKOFF_JITTER)))
+        if time.monotonic() + delay > deadline:
+            print(f"⏰ Recovery deadline reached for {asset_info['asset_id']} - giving up")
+            break
+        time.sleep(delay)
+    
+    return None, status
+
+def recover_failed_assets(failed_assets, max_retries=3, deadline_seconds=RECOVERY_DEADLINE_SECONDS):
     """
     Attempt to recover assets that failed during initial processing.
+    Recoverable assets are retried concurrently so their backoff sleeps overlap.
     
     Args:
         failed_assets: List of failed asset info from process_arc19_collection_robust
         max_retries: Maximum retry attempts per asset
+        deadline_seconds: Wall-clock budget for the whole recovery pass
     
     Returns:
         dict with recovery results
@@ -3182,48 +3324,53 @@ def recover_failed_assets(failed_assets, max_retries=3):
         'recovered_assets': [],
         'still_failed_assets': [],
         'recovery_count': 0,
-        'permanent_failures': 0
+        'permanent_failures': 0,
+        'skipped_by_type': {},
+        'errors_by_type': {}
     }
     
     print(f"🔄 RECOVERY: Attempting to recover {len(failed_assets)} failed assets")
     
+    # Partition up front - deterministic failures are reported without any network call
+    recoverable = []
     for asset_info in failed_assets:
-        if asset_info['error'] in ['fetch_timeout', 'fetch_failed']:
-            metadata_cid = asset_info.get('metadata_cid')
-            if metadata_cid:
-                # Clear from cache to force fresh attempt
-                if metadata_cid in _metadata_cache:
-                    del _metadata_cache[metadata_cid]
-                
-                # Retry with maximum effort
-                print(f"🔄 Retrying {asset_info['asset_id']}: {metadata_cid[:16]}...")
-                fetch_result = fetch_metadata_and_extract_image_cid(metadata_cid, max_retries=max_retries)
-                
-                if len(fetch_result) == 3:
-                    image_cid, metadata, status = fetch_result
-                else:
-                    image_cid, metadata = fetch_result
-                    status = "legacy_format"
-                
-                if status == "success":
-                    print(f"✅ RECOVERED: {asset_info['asset_id']}")
-                    recovery_results['recovered_assets'].append({
-                        **asset_info,
-                        'image_cid': image_cid,
-                        'recovery_status': 'success'
-                    })
-                    recovery_results['recovery_count'] += 1
-                else:
-                    print(f"❌ STILL FAILED: {asset_info['asset_id']}")
-                    recovery_results['still_failed_assets'].append(asset_info)
-                    recovery_results['permanent_failures'] += 1
-            else:
-                recovery_results['still_failed_assets'].append(asset_info)
-                recovery_results['permanent_failures'] += 1
+        if asset_info['error'] in RECOVERABLE_ERRORS and asset_info.get('metadata_cid'):
+            recoverable.append(asset_info)
         else:
-            # Non-recoverable error type
             recovery_results['still_failed_assets'].append(asset_info)
             recovery_results['permanent_failures'] += 1
+            skipped = recovery_results['skipped_by_type']
+            skipped[asset_info['error']] = skipped.get(asset_info['error'], 0) + 1
+    
+    for error_type, count in recovery_results['skipped_by_type'].items():
+        print(f"⏭️ RECOVERY: Skipping {count} assets with non-recoverable error '{error_type}'")
+    
+    if recoverable:
+        deadline = time.monotonic() + deadline_seconds
+        with ThreadPoolExecutor(max_workers=min(METADATA_FETCH_WORKERS, len(recoverable))) as executor:
+            outcomes = list(executor.map(
+                lambda asset_info: _recover_single_asset(asset_info, max_retries, deadline),
+                recoverable
+            ))
+        
+        for asset_info, (image_cid, status) in zip(recoverable, outcomes):
+            if status == "success":
+                print(f"✅ RECOVERED: {asset_info['asset_id']}")
+                recovery_results['recovered_assets'].append({
+                    **asset_info,
+                    'image_cid': image_cid,
+                    'recovery_status': 'success'
+                })
+                recovery_results['recovery_count'] += 1
+            else:
+                print(f"❌ STILL FAILED: {asset_info['asset_id']}")
+                recovery_results['still_failed_assets'].append(asset_info)
+                recovery_results['permanent_failures'] += 1
+    
+    # Error breakdown of what is still failing after recovery
+    for asset_info in recovery_results['still_failed_assets']:
+        errors_by_type = recovery_results['errors_by_type']
+        errors_by_type[asset_info['error']] = errors_by_type.get(asset_info['error'], 0) + 1
     
     print(f"🎯 RECOVERY COMPLETE:")
     print(f"   ✅ Recovered: {recovery_results['recovery_count']}")
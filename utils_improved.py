@@ -1,11 +1,82 @@
+import hashlib
+import json
+import logging
+import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def _get_4everland_pin_lookup_improved(api_key):
+logger = logging.getLogger(__name__)
+
+# One pooled session for all pin API calls: connections (and TLS) are reused across pages,
+# and urllib3 retries timeouts, 429s and 5xx with exponential backoff, honouring Retry-After
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True
+    )
+))
+
+# On-disk cache for the full pin lookup so repeat verifications skip the paginated fetch
+PIN_LOOKUP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cyber_repinning")
+PIN_LOOKUP_CACHE_TTL = 300  # seconds
+
+# Pins per page: larger pages mean fewer round trips; fall back to the classic size if rejected
+PIN_PAGE_LIMIT = 2000
+PIN_PAGE_FALLBACK_LIMIT = 1000
+PIN_LOOKUP_MAX_PINS = 50000  # Safety limit - prevent infinite loops
+
+def _pin_lookup_cache_path(api_key):
+    """Cache file for an API key (keyed by hash so the key itself never touches disk)."""
+    key = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    return os.path.join(PIN_LOOKUP_CACHE_DIR, f"pins_{key}.json")
+
+def _load_cached_pin_lookup(api_key, ttl=PIN_LOOKUP_CACHE_TTL):
+    """
+    Return the cached pin lookup if it is younger than ttl seconds.
+    Returns: dict {cid: status} or None if missing/stale/unreadable
+    """
+    cache_path = _pin_lookup_cache_path(api_key)
+    try:
+        if time.time() - os.path.getmtime(cache_path) >= ttl:
+            return None
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_pin_lookup_cache(api_key, pin_lookup):
+    """Atomically write the pin lookup to the cache (best effort)."""
+    cache_path = _pin_lookup_cache_path(api_key)
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(PIN_LOOKUP_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(pin_lookup, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write pin lookup cache: %s", e)
+
+def _get_4everland_pin_lookup_improved(api_key, use_cache=True):
     """
     Fetch all pins from 4everland and return a lookup dictionary.
+    A lookup fetched within the last PIN_LOOKUP_CACHE_TTL seconds is served from disk
+    unless use_cache is False.
     Returns: dict {cid: status} or None if failed
     """
+    if use_cache:
+        cached_lookup = _load_cached_pin_lookup(api_key)
+        if cached_lookup is not None:
+            logger.debug("Using cached lookup for %d unique pins", len(cached_lookup))
+            return cached_lookup
+    
     try:
         url = "https://api.4everland.dev/pins"
         headers = {
@@ -13,56 +84,62 @@ def _get_4everland_pin_lookup_improved(api_key):
             'Content-Type': 'application/json'
         }
         
-        # Start with first page
-        all_results = []
-        limit = 1000
+        # Start with first page; each page is folded into the lookup as it arrives
+        pin_lookup = {}
+        total_pins = 0
+        limit = PIN_PAGE_LIMIT
         offset = 0
         page_count = 0
-        max_pages = 50  # Safety limit - prevent infinite loops
-        start_time = time.time()
+        reached_end = False  # Only a lookup that ran to the last page is complete enough to cache
+        max_pages = PIN_LOOKUP_MAX_PINS // limit
+        start_time = time.monotonic()
         
-        print(f"DEBUG VERIFICATION: Starting pin fetch with safety limits (max {max_pages} pages, 5min timeout)")
+        logger.debug("Starting pin fetch with safety limits (max %d pages, 5min timeout)", max_pages)
         
         # Handle pagination to get all pins
         while page_count < max_pages:
-            page_start_time = time.time()
+            page_start_time = time.perf_counter()
             
             params = {
                 'limit': limit,
                 'offset': offset
             }
             
-            print(f"DEBUG VERIFICATION: Fetching page {page_count + 1} (offset {offset})...")
+            logger.debug("Fetching page %d (offset %d)...", page_count + 1, offset)
             
             try:
-                response = requests.get(url, headers=headers, params=params, timeout=30)
-            except requests.Timeout:
-                print(f"DEBUG VERIFICATION: Timeout on page {page_count + 1} - retrying once...")
-                try:
-                    response = requests.get(url, headers=headers, params=params, timeout=45)
-                except requests.Timeout:
-                    print(f"DEBUG VERIFICATION: Second timeout on page {page_count + 1} - aborting")
-                    break
+                response = _session.get(url, headers=headers, params=params, timeout=30)
+            except requests.RequestException as e:
+                # The session adapter has already retried with backoff. Report failure like the
+                # non-200 branch below - a partial lookup would show pinned CIDs as missing
+                logger.warning("Page %d failed after retries (%s) - aborting", page_count + 1, e)
+                return None
             
-            page_time = time.time() - page_start_time
+            page_time = time.perf_counter() - page_start_time
             
             if response.status_code == 200:
                 data = response.json()
                 results = data.get('results', [])
-                all_results.extend(results)
+                pin_lookup.update({
+                    pin['pin']['cid']: pin.get('status', 'unknown')
+                    for pin in results
+                    if 'pin' in pin and pin['pin'].get('cid')
+                })
+                total_pins += len(results)
                 page_count += 1
                 
-                print(f"DEBUG VERIFICATION: Page {page_count} retrieved {len(results)} pins in {page_time:.1f}s (total: {len(all_results)})")
+                logger.debug("Page %d retrieved %d pins in %.1fs (total: %d)", page_count, len(results), page_time, total_pins)
                 
                 # If we got fewer results than the limit, we've reached the end
                 if len(results) < limit:
-                    print(f"DEBUG VERIFICATION: Reached end of results (got {len(results)} < {limit})")
+                    logger.debug("Reached end of results (got %d < %d)", len(results), limit)
+                    reached_end = True
                     break
                 
                 # Safety check for total time
-                total_time = time.time() - start_time
+                total_time = time.monotonic() - start_time
                 if total_time > 300:  # 5 minutes
-                    print(f"DEBUG VERIFICATION: Timeout after {total_time:.1f}s - stopping at {len(all_results)} pins")
+                    logger.warning("Timeout after %.1fs - stopping at %d pins", total_time, total_pins)
                     break
                     
                 offset += limit
@@ -70,33 +147,30 @@ def _get_4everland_pin_lookup_improved(api_key):
                 # Add small delay to be nice to the API
                 time.sleep(0.5)
                 
+            elif response.status_code == 400 and page_count == 0 and limit > PIN_PAGE_FALLBACK_LIMIT:
+                # Server rejected the larger page size - retry the first page at the classic size
+                logger.debug("Page limit %d rejected - falling back to %d", limit, PIN_PAGE_FALLBACK_LIMIT)
+                limit = PIN_PAGE_FALLBACK_LIMIT
+                max_pages = PIN_LOOKUP_MAX_PINS // limit
+                
             else:
-                print(f"DEBUG VERIFICATION: Failed to fetch page {page_count + 1}: HTTP {response.status_code}")
-                if response.status_code == 429:  # Rate limited
-                    print("DEBUG VERIFICATION: Rate limited - waiting 10 seconds before retry...")
-                    time.sleep(10)
-                    continue
-                else:
-                    return None
+                logger.warning("Failed to fetch page %d: HTTP %d", page_count + 1, response.status_code)
+                return None
         
         if page_count >= max_pages:
-            print(f"DEBUG VERIFICATION: Hit page limit ({max_pages}) - got {len(all_results)} pins")
+            logger.warning("Hit page limit (%d) - got %d pins", max_pages, total_pins)
         
-        total_time = time.time() - start_time
-        print(f"DEBUG VERIFICATION: Completed in {total_time:.1f}s - retrieved {len(all_results)} pins across {page_count} pages")
-        
-        # Create lookup dictionary
-        pin_lookup = {}
-        for pin in all_results:
-            pin_cid = pin.get('pin', {}).get('cid', '')
-            status = pin.get('status', 'unknown')
-            if pin_cid:
-                pin_lookup[pin_cid] = status
+        total_time = time.monotonic() - start_time
+        logger.debug("Completed in %.1fs - retrieved %d pins across %d pages", total_time, total_pins, page_count)
         
-        print(f"DEBUG VERIFICATION: Created lookup for {len(pin_lookup)} unique pins")
+        logger.debug("Created lookup for %d unique pins", len(pin_lookup))
+        if reached_end:
+            _save_pin_lookup_cache(api_key, pin_lookup)
+        else:
+            logger.warning("Pin lookup is incomplete - not caching it")
         return pin_lookup
         
     except Exception as e:
-        print(f"DEBUG VERIFICATION: Exception fetching pin lookup: {str(e)}")
+        logger.error("Exception fetching pin lookup: %s", e)
         return None
 